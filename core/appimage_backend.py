@@ -4,34 +4,40 @@ from pathlib import Path
 
 class AppImageBackend:
     @staticmethod
-    def get_appimages():
-        appimages = []
-        scan_dirs = [
+    def scan_dirs():
+        return [
             Path.home() / "Applications",
             Path.home() / "Downloads",
             Path.home() / "Desktop",
             Path.home()
         ]
-        
-        for d in scan_dirs:
+
+    @staticmethod
+    def get_appimages():
+        appimages = []
+        for d in AppImageBackend.scan_dirs():
             if d.exists():
                 try:
                     for f in d.iterdir():
                         if f.suffix.lower() == ".appimage":
-                            stats = f.stat()
-                            size = f"{stats.st_size / (1024*1024):.1f} MB"
-                            appimages.append({
-                                "name": f.name,
-                                "path": str(f),
-                                "version": "-",
-                                "size": size,
-                                "description": f"AppImage in {f.parent}",
-                                "type": "AppImage",
-                                "install_date": "Found locally"
-                            })
+                            appimages.append(AppImageBackend.entry(f))
                 except: pass
         return appimages
 
+    @staticmethod
+    def entry(f):
+        stats = f.stat()
+        size = f"{stats.st_size / (1024*1024):.1f} MB"
+        return {
+            "name": f.name,
+            "path": str(f),
+            "version": "-",
+            "size": size,
+            "description": f"AppImage in {f.parent}",
+            "type": "AppImage",
+            "install_date": "Found locally"
+        }
+
     @staticmethod
     def create_desktop_file(name, path):
         """Creates a .desktop file in ~/.local/share/applications/"""
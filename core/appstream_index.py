@@ -0,0 +1,254 @@
+import os
+import gzip
+import threading
+import xml.etree.ElementTree as ET
+from core.cache import DiskCache
+from core.search_index import SearchIndex
+from core.flatpak_backend import FlatpakBackend
+
+# Where distributions keep the DEP-11 YAML and AppStream XML catalogs of their repositories
+YAML_DIRS = ["/var/lib/swcatalog/yaml", "/var/lib/app-info/yaml"]
+XML_DIRS = ["/var/lib/swcatalog/xml", "/var/cache/app-info/xmls", "/usr/share/swcatalog/xml"]
+APP_TYPES = {"desktop-application", "desktop", "console-application", "web-application"}
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+ICON_SIZES = ["64x64", "128x128", "48x48"]
+
+class AppStreamIndex:
+    """Offline application catalog built from the AppStream data apt and flatpak keep on disk.
+    Catalogs are streamed through gzip (YAML line by line, XML with iterparse), never loaded whole,
+    and cached per file by size/mtime like the APT list index."""
+    CACHE_NAME = "appstream_index.json"
+    CACHE_VERSION = 2
+    _state = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _open(path):
+        if path.endswith(".gz"):
+            return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+        return open(path, "r", encoding="utf-8", errors="replace")
+
+    @staticmethod
+    def catalog_files():
+        """[(path, format, backend)] for every readable catalog, symlinked duplicates removed"""
+        files, seen = [], set()
+
+        def add(path, fmt, backend):
+            real = os.path.realpath(path)
+            if real in seen or not os.path.exists(real): return
+            seen.add(real)
+            files.append((path, fmt, backend))
+
+        for fmt, dirs in (("yaml", YAML_DIRS), ("xml", XML_DIRS)):
+            for d in dirs:
+                try:
+                    names = sorted(os.listdir(d))
+                except OSError:
+                    continue
+                for name in names:
+                    if name.endswith((".yml", ".yml.gz", ".xml", ".xml.gz")):
+                        add(os.path.join(d, name), fmt, "APT")
+        for root in FlatpakBackend.installation_dirs():
+            appstream = root / "appstream"
+            try:
+                remotes = sorted(os.listdir(appstream))
+            except OSError:
+                continue
+            for remote in remotes:
+                try:
+                    arches = sorted(os.listdir(appstream / remote))
+                except OSError:
+                    continue
+                for arch in arches:
+                    active = appstream / remote / arch / "active"
+                    for name in ("appstream.xml.gz", "appstream.xml"):
+                        if (active / name).exists():
+                            add(str(active / name), "xml", "Flatpak")
+                            break
+        return files
+
+    @staticmethod
+    def icon_dirs(path, fmt, backend, origin):
+        """Directories holding the cached icons of a catalog, best size first"""
+        if backend == "Flatpak":
+            base = os.path.join(os.path.dirname(path), "icons")
+            return [os.path.join(base, size) for size in ICON_SIZES]
+        roots = [os.path.join(os.path.dirname(d), "icons") for d in YAML_DIRS] + ["/var/cache/app-info/icons"]
+        return [os.path.join(root, origin or "", size) for root in roots for size in ICON_SIZES]
+
+    @staticmethod
+    def _find_icon(dirs, name):
+        if not name: return None
+        for d in dirs:
+            path = os.path.join(d, name)
+            if os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def _unquote(value):
+        value = value.strip()
+        if len(value) >= 2 and value[0] == value[-1] == "'":
+            return value[1:-1].replace("''", "'")
+        if len(value) >= 2 and value[0] == value[-1] == '"':
+            return value[1:-1]
+        return value
+
+    @staticmethod
+    def parse_yaml(path):
+        """Streams a DEP-11 file. Only the keys the catalog needs are understood: a tiny line-based
+        reader instead of a YAML parser, since DEP-11 documents are machine-written and regular."""
+        apps, origin = [], None
+        doc, key, sub = {}, None, None
+
+        def flush(doc):
+            # Components without a Package (metainfo-only, or shipped outside the archive) cannot be installed
+            if doc.get("Type") in APP_TYPES and doc.get("ID") and doc.get("Package"):
+                apps.append(doc)
+
+        with AppStreamIndex._open(path) as f:
+            for line in f:
+                line = line.rstrip("\n")
+                if line.startswith("---"):
+                    flush(doc)
+                    doc, key, sub = {}, None, None
+                    continue
+                stripped = line.strip()
+                if not stripped or stripped.startswith("#"): continue
+                indent = len(line) - len(line.lstrip(" "))
+                if stripped.startswith("- "):
+                    value = stripped[2:]
+                    if key == "Categories":
+                        doc.setdefault("Categories", []).append(AppStreamIndex._unquote(value))
+                    elif key == "Keywords" and sub == "C":
+                        doc.setdefault("Keywords", []).append(AppStreamIndex._unquote(value))
+                    elif key == "Icon" and sub == "cached" and value.startswith("name:"):
+                        doc.setdefault("CachedIcons", []).append(AppStreamIndex._unquote(value[5:]))
+                    continue
+                field, _, value = stripped.partition(":")
+                if indent == 0:
+                    key, sub = field, None
+                    if value.strip():
+                        doc[key] = AppStreamIndex._unquote(value)
+                        if key == "Origin": origin = doc[key]
+                elif indent == 2:
+                    sub = field
+                    if key in ("Name", "Summary") and field == "C":
+                        doc[key] = AppStreamIndex._unquote(value)
+                elif key == "Icon" and sub == "cached" and field == "name":
+                    doc.setdefault("CachedIcons", []).append(AppStreamIndex._unquote(value))
+            flush(doc)
+
+        dirs = AppStreamIndex.icon_dirs(path, "yaml", "APT", origin)
+        return [AppStreamIndex._record(
+            doc["ID"], doc.get("Name", doc["ID"]), doc.get("Summary", ""), doc.get("Categories", []),
+            doc.get("Keywords", []), doc["Package"], "APT",
+            next((p for p in (AppStreamIndex._find_icon(dirs, n) for n in doc.get("CachedIcons", [])) if p), None),
+        ) for doc in apps]
+
+    @staticmethod
+    def parse_xml(path, backend):
+        """Streams an AppStream XML catalog with iterparse, clearing each component once read"""
+        apps, origin, root, dirs = [], None, None, None
+        with AppStreamIndex._open(path) as f:
+            for event, elem in ET.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if root is None:
+                        root = elem
+                        origin = elem.get("origin")
+                        dirs = AppStreamIndex.icon_dirs(path, "xml", backend, origin)
+                    continue
+                if elem.tag != "component": continue
+                if elem.get("type", "desktop-application") in APP_TYPES:
+                    apps.append(AppStreamIndex._component(elem, backend, dirs))
+                root.clear()
+        return [app for app in apps if app]
+
+    @staticmethod
+    def _component(elem, backend, dirs):
+        def text(tag):
+            for child in elem.findall(tag):
+                if child.get(XML_LANG) in (None, "C", "en") and child.text:
+                    return child.text.strip()
+            return ""
+
+        app_id = text("id")
+        if not app_id: return None
+        icon = None
+        for child in elem.findall("icon"):
+            if child.get("type") == "cached" and child.text:
+                icon = AppStreamIndex._find_icon(dirs, child.text.strip())
+                if icon: break
+        package = text("pkgname")
+        if backend == "APT" and not package: return None
+        if backend == "Flatpak":
+            # bundle is app/<id>/<arch>/<branch>; installs take the bare application id
+            bundle = text("bundle")
+            package = bundle.split("/")[1] if bundle.count("/") >= 2 else app_id.removesuffix(".desktop")
+        categories = [c.text.strip() for c in elem.iterfind("categories/category") if c.text]
+        keywords = [k.text.strip() for k in elem.iterfind("keywords/keyword") if k.text and k.get(XML_LANG) in (None, "C", "en")]
+        return AppStreamIndex._record(app_id, text("name") or app_id, text("summary"), categories, keywords, package, backend, icon)
+
+    @staticmethod
+    def _record(app_id, name, summary, categories, keywords, package, backend, icon):
+        return {"id": app_id, "name": name, "summary": summary, "categories": categories,
+                "keywords": keywords, "package": package, "type": backend, "icon": icon}
+
+    @staticmethod
+    def parse(entry):
+        path, fmt, backend = entry
+        if fmt == "yaml":
+            return AppStreamIndex.parse_yaml(path)
+        return AppStreamIndex.parse_xml(path, backend)
+
+    @staticmethod
+    def load():
+        """Builds (or returns the current) in-memory catalog; cheap when no catalog file changed"""
+        with AppStreamIndex._lock:
+            files = AppStreamIndex.catalog_files()
+            signature = [[path, DiskCache.stat_key(path)] for path, _, _ in files]
+            state = AppStreamIndex._state
+            if state is not None and state["signature"] == signature:
+                return state
+
+            kinds = {path: (path, fmt, backend) for path, fmt, backend in files}
+            cached = DiskCache.load(AppStreamIndex.CACHE_NAME, AppStreamIndex.CACHE_VERSION) or {}
+            catalogs, changed = DiskCache.refresh_files(list(kinds), cached, lambda p: AppStreamIndex.parse(kinds[p]))
+            if changed:
+                DiskCache.save(AppStreamIndex.CACHE_NAME, AppStreamIndex.CACHE_VERSION, catalogs)
+
+            # The same application appears once per origin; the first catalog wins
+            apps, seen = [], set()
+            for path, _, _ in files:
+                for app in catalogs.get(path, {}).get("data", []):
+                    key = (app["type"], app["package"])
+                    if key in seen: continue
+                    seen.add(key)
+                    apps.append(app)
+            index = SearchIndex()
+            for app in apps:
+                index.add(app["name"], " ".join([app["summary"], app["id"], app["package"]] + app["keywords"] + app["categories"]))
+            index.build()
+            state = {"signature": signature, "apps": apps, "index": index}
+            AppStreamIndex._state = state
+            return state
+
+    @staticmethod
+    def has_catalog(backend):
+        return any(app["type"] == backend for app in AppStreamIndex.load()["apps"])
+
+    @staticmethod
+    def search(query, backend, limit=None):
+        """Ranked applications of one backend matching `query`, as Discover result dicts"""
+        state = AppStreamIndex.load()
+        results = []
+        for doc, score in state["index"].search(query, budget=None):
+            app = state["apps"][doc]
+            if app["type"] != backend: continue
+            results.append({
+                "name": app["name"], "id": app["id"], "package": app["package"],
+                "description": app["summary"], "categories": app["categories"], "icon": app["icon"],
+                "type": backend, "version": "", "install_date": "In repo", "score": score, "app": True,
+            })
+            if limit and len(results) >= limit: break
+        return results
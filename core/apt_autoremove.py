@@ -0,0 +1,196 @@
+import os
+import re
+from core.cache import DiskCache
+from core.debversion import DebVersion
+from core.dpkg_status import DpkgStatus, STATUS_FILE, EXTENDED_STATES_FILE
+
+APT_CONF = "/etc/apt/apt.conf"
+APT_CONF_DIR = "/etc/apt/apt.conf.d"
+DEP_FIELDS = ("Depends", "Pre-Depends", "Recommends", "Suggests")
+FIELDS = DEP_FIELDS + ("Provides", "Version", "Status", "Priority", "Essential", "Important", "Protected", "Installed-Size")
+DEP = re.compile(r"^\s*([^\s:(]+)(?::\S+)?\s*(?:\(\s*(<<|<=|>=|>>|=|<|>)\s*([^)\s]+)\s*\))?")
+# Versioned kernel images; the group is the kernel's version without its flavour (5.15.0-91)
+KERNEL_IMAGE = re.compile(r"^(?:linux|kfreebsd|gnumach)-image-(?:unsigned-)?(\d+(?:\.\d+)*(?:-\d+)?)")
+KERNEL_RELEASE = re.compile(r"^(\d+(?:\.\d+)*(?:-\d+)?)")
+# apt.conf tokens: strings, comments, scope braces, statement ends and bare words
+CONF_TOKEN = re.compile(r'"[^"]*"|//[^\n]*|#[^\n]*|/\*.*?\*/|[{};]|[^\s{};"]+', re.S)
+
+class AptAutoremove:
+    """Native `apt-get -s autoremove`: the installed packages apt would garbage-collect.
+    Roots are the manually installed, Essential, Important/Protected, Priority: required, held and
+    APT::NeverAutoRemove packages, and, as apt does at runtime (APT::Protect-Kernels), the packages
+    of the running, the latest and the previous kernel (APT::VersionedKernelPackages). Everything reachable from them through Depends and Pre-Depends
+    (and Recommends and Suggests unless APT::AutoRemove::*Important says otherwise) is kept, every
+    installed alternative of an or-group and every installed provider of a virtual package
+    included. The rest of the auto-installed packages are orphans."""
+    _cached = None
+
+    @staticmethod
+    def config_files():
+        files = [APT_CONF] if os.path.isfile(APT_CONF) else []
+        try:
+            names = sorted(os.listdir(APT_CONF_DIR))
+        except OSError:
+            names = []
+        for name in names:
+            # apt reads files made of letters, digits, _ - . only, without an extension or ending in .conf
+            if not re.match(r"^[A-Za-z0-9_.\-]+$", name) or ("." in name and not name.endswith(".conf")): continue
+            path = os.path.join(APT_CONF_DIR, name)
+            if os.path.isfile(path): files.append(path)
+        return files
+
+    @staticmethod
+    def read_config(files=None):
+        """[(key, value)] in file order; list items get their scope as key ("APT::NeverAutoRemove")"""
+        entries = []
+        for path in files if files is not None else AptAutoremove.config_files():
+            try:
+                with open(path, "r", errors="replace") as f:
+                    text = f.read()
+            except OSError:
+                continue
+            scope, key = [], None
+            for token in CONF_TOKEN.findall(text):
+                if token.startswith(("//", "#", "/*")): continue
+                if token == "{":
+                    scope.append(key or "")
+                    key = None
+                elif token == "}":
+                    if scope: scope.pop()
+                    key = None
+                elif token == ";":
+                    key = None
+                elif token.startswith('"'):
+                    name = "::".join(scope + ([key] if key else [])).rstrip(":")
+                    entries.append((name.lower(), token[1:-1]))
+                    key = None
+                else:
+                    key = token
+        return entries
+
+    @staticmethod
+    def parse_depends(value):
+        """'a (>= 1) | b, c' -> [[("a", ">=", "1"), ("b", None, None)], [("c", None, None)]]"""
+        groups = []
+        for group in value.split(","):
+            alternatives = []
+            for alt in group.split("|"):
+                m = DEP.match(alt)
+                if m: alternatives.append(m.groups())
+            if alternatives: groups.append(alternatives)
+        return groups
+
+    @staticmethod
+    def satisfies(version, op, wanted):
+        if op is None: return True
+        if version is None: return False
+        cmp = DebVersion.compare(version, wanted)
+        return {"<<": cmp < 0, "<": cmp <= 0, "<=": cmp <= 0, "=": cmp == 0,
+                ">=": cmp >= 0, ">": cmp >= 0, ">>": cmp > 0}[op]
+
+    @staticmethod
+    def kernel_patterns(installed, versioned, running):
+        """Regexes for the packages of the kernels apt protects: the running one and the two most
+        recent installed images"""
+        images = {}
+        for name, fields in installed.items():
+            m = KERNEL_IMAGE.match(name)
+            if m:
+                version = images.get(m.group(1))
+                if version is None or DebVersion.compare(fields.get("Version", ""), version) > 0:
+                    images[m.group(1)] = fields.get("Version", "")
+        kept = sorted(images, key=lambda k: DebVersion.sort_key(images[k]), reverse=True)[:2]
+        m = KERNEL_RELEASE.match(running or "")
+        if m and m.group(1) not in kept: kept.append(m.group(1))
+        if not kept or not versioned: return []
+        # linux-image-5.15.0-91-generic, linux-modules-5.15.0-91-generic, linux-headers-5.15.0-91...
+        regex = "^(?:" + "|".join(versioned) + ")-(?:" + "|".join(re.escape(k) for k in kept) + ")(?:-.*)?$"
+        try:
+            return [re.compile(regex)]
+        except re.error:
+            return []
+
+    @staticmethod
+    def compute(installed, auto, config, running=None):
+        """Returns {orphan: Installed-Size in KiB}, from the status fields of the installed packages,
+        the auto-installed names, the apt.conf entries and the running kernel's release"""
+        follow = ["Depends", "Pre-Depends"]
+        flags = {"recommends": "true", "suggests": "true", "kernels": "true"}
+        never, versioned = [], []
+        for key, value in config:
+            if key == "apt::neverautoremove":
+                never.append(value)
+            elif key == "apt::versionedkernelpackages":
+                versioned.append(value)
+            elif key == "apt::autoremove::recommendsimportant":
+                flags["recommends"] = value.lower()
+            elif key == "apt::autoremove::suggestsimportant":
+                flags["suggests"] = value.lower()
+            elif key == "apt::protect-kernels":
+                flags["kernels"] = value.lower()
+        enabled = lambda flag: flags[flag] in ("true", "yes", "1", "on")
+        for field, flag in (("Recommends", "recommends"), ("Suggests", "suggests")):
+            if enabled(flag): follow.append(field)
+        patterns = []
+        for pattern in never:
+            try:
+                patterns.append(re.compile(pattern))
+            except re.error: pass
+        if enabled("kernels"):
+            patterns += AptAutoremove.kernel_patterns(installed, versioned, running)
+
+        providers = {}
+        for name, fields in installed.items():
+            for group in AptAutoremove.parse_depends(fields.get("Provides", "")):
+                virtual, _, version = group[0]
+                providers.setdefault(virtual, []).append((name, version))
+
+        def targets(alt):
+            name, op, wanted = alt
+            if name in installed and AptAutoremove.satisfies(installed[name].get("Version"), op, wanted):
+                yield name
+            for provider, version in providers.get(name, ()):
+                # An unversioned Provides only satisfies unversioned dependencies
+                if AptAutoremove.satisfies(version, op, wanted):
+                    yield provider
+
+        roots = [name for name, fields in installed.items()
+                 if name not in auto
+                 or any(fields.get(flag) == "yes" for flag in ("Essential", "Important", "Protected"))
+                 # Not a documented root, but apt's MarkRequired keeps them ("be nice even then a
+                 # required package might break"); without it, all-auto systems list apt itself
+                 or fields.get("Priority") == "required"
+                 or fields.get("Status", "").startswith("hold ")
+                 or any(p.search(name) for p in patterns)]
+        kept, stack = set(roots), roots
+        while stack:
+            fields = installed[stack.pop()]
+            for field in follow:
+                for group in AptAutoremove.parse_depends(fields.get(field, "")):
+                    for alt in group:
+                        for target in targets(alt):
+                            if target not in kept:
+                                kept.add(target)
+                                stack.append(target)
+
+        orphans = {}
+        for name, fields in installed.items():
+            if name in kept: continue
+            try:
+                orphans[name] = int(fields.get("Installed-Size", "0"))
+            except ValueError:
+                orphans[name] = 0
+        return orphans
+
+    @staticmethod
+    def orphans():
+        """{orphan: Installed-Size in KiB}; recomputed only when dpkg, apt's marks or apt.conf changed"""
+        files = AptAutoremove.config_files()
+        key = [DiskCache.stat_key(p) for p in [STATUS_FILE, EXTENDED_STATES_FILE] + files] + files
+        if AptAutoremove._cached is not None and AptAutoremove._cached[0] == key:
+            return dict(AptAutoremove._cached[1])
+        installed = DpkgStatus.read_installed(FIELDS)
+        result = AptAutoremove.compute(installed, DpkgStatus.read_auto_installed(), AptAutoremove.read_config(files),
+                                       os.uname().release)
+        AptAutoremove._cached = (key, result)
+        return dict(result)
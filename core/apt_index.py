@@ -0,0 +1,166 @@
+import os
+import bz2
+import gzip
+import lzma
+import threading
+import subprocess
+from core.cache import DiskCache
+from core.dpkg_status import DpkgStatus
+from core.apt_policy import AptPolicy
+from core.search_index import SearchIndex
+
+LISTS_DIR = "/var/lib/apt/lists"
+COMPRESSED = {".gz": gzip.open, ".xz": lzma.open, ".lzma": lzma.open, ".bz2": bz2.open}
+# Formats without a stdlib module are decompressed by their command-line tool
+DECOMPRESSORS = {".lz4": ["lz4", "-dc"], ".zst": ["zstd", "-dc"]}
+
+class AptIndex:
+    """Offline search over the repository `Packages` files in /var/lib/apt/lists.
+    Each list file is parsed once and cached by size/mtime; only changed files are re-read."""
+    CACHE_NAME = "apt_index.json"
+    CACHE_VERSION = 2
+    PAGE_SIZE = 50
+    _state = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def list_files(lists_dir=LISTS_DIR):
+        """Returns (Packages files, Translation-en files)"""
+        packages, translations = [], []
+        try:
+            names = sorted(os.listdir(lists_dir))
+        except OSError:
+            return packages, translations
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            if ext not in COMPRESSED and ext not in DECOMPRESSORS: stem = name
+            path = os.path.join(lists_dir, name)
+            if stem.endswith("_Packages"):
+                packages.append(path)
+            elif stem.endswith("_i18n_Translation-en"):
+                translations.append(path)
+        return packages, translations
+
+    @staticmethod
+    def _read(path):
+        """mmap for plain list files, decompressed bytes for compressed ones. Raises OSError or
+        CalledProcessError when a file cannot be decompressed (its tool is not installed)."""
+        ext = os.path.splitext(path)[1]
+        if ext in DECOMPRESSORS:
+            return subprocess.run(DECOMPRESSORS[ext] + [path], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, check=True).stdout
+        opener = COMPRESSED.get(ext)
+        if opener is None:
+            return DpkgStatus._open(path)
+        with opener(path, "rb") as f:
+            return f.read()
+
+    @staticmethod
+    def _summary(value):
+        return value.decode("utf-8", "replace") if value else ""
+
+    @staticmethod
+    def parse_packages(path):
+        """[[name, version, summary, description md5, architecture]] for every stanza of a Packages file"""
+        rows = []
+        data = AptIndex._read(path)
+        if data is None: return rows
+        try:
+            for start, end in DpkgStatus._stanzas(data):
+                name = DpkgStatus._field(data, start, end, b"Package")
+                version = DpkgStatus._field(data, start, end, b"Version")
+                if not name or not version: continue
+                desc = DpkgStatus._field(data, start, end, b"Description")
+                md5 = None if desc else DpkgStatus._field(data, start, end, b"Description-md5")
+                arch = DpkgStatus._field(data, start, end, b"Architecture")
+                rows.append([name.decode(), version.decode(), AptIndex._summary(desc), md5.decode() if md5 else None, arch.decode() if arch else "all"])
+        finally:
+            if hasattr(data, "close"): data.close()
+        return rows
+
+    @staticmethod
+    def parse_translations(path):
+        """{description md5: summary} from a Translation-en file"""
+        summaries = {}
+        data = AptIndex._read(path)
+        if data is None: return summaries
+        try:
+            for start, end in DpkgStatus._stanzas(data):
+                md5 = DpkgStatus._field(data, start, end, b"Description-md5")
+                desc = DpkgStatus._field(data, start, end, b"Description-en")
+                if md5 and desc:
+                    summaries[md5.decode()] = AptIndex._summary(desc)
+        finally:
+            if hasattr(data, "close"): data.close()
+        return summaries
+
+    @staticmethod
+    def merge(packages, translations, arch=None, pins=()):
+        """{name: [candidate version, summary]}: the version apt would install, chosen among the
+        native (`arch`) and architecture-independent stanzas with the archive priorities and pins"""
+        summaries = {}
+        for entry in translations.values():
+            summaries.update(entry["data"])
+        versions, described = {}, {}
+        for path, entry in packages.items():
+            info = AptPolicy.release_info(path)
+            default = AptPolicy.default_priority(info)
+            for name, version, summary, md5, stanza_arch in entry["data"]:
+                if arch and stanza_arch not in ("all", arch): continue
+                prio = AptPolicy.priority(pins, name, version, info) if pins else default
+                known = versions.setdefault(name, {})
+                known[version] = max(prio, known.get(version, prio))
+                described.setdefault((name, version), summary or summaries.get(md5, ""))
+        merged = {}
+        for name, available in versions.items():
+            candidate = AptPolicy.candidate(None, available)
+            # Every version pinned below 0: apt would not install the package
+            if candidate is not None:
+                merged[name] = [candidate, described[(name, candidate)]]
+        return merged
+
+    @staticmethod
+    def load(lists_dir=LISTS_DIR):
+        """Builds (or returns the current) in-memory index; cheap when no list file changed"""
+        with AptIndex._lock:
+            package_paths, translation_paths = AptIndex.list_files(lists_dir)
+            pin_files = AptPolicy.preference_files()
+            signature = [[p, DiskCache.stat_key(p)] for p in package_paths + translation_paths + pin_files]
+            state = AptIndex._state
+            if state is not None and state["signature"] == signature:
+                return state
+
+            cached = DiskCache.load(AptIndex.CACHE_NAME, AptIndex.CACHE_VERSION) or {}
+            packages, p_changed = DiskCache.refresh_files(package_paths, cached.get("packages", {}), AptIndex.parse_packages)
+            translations, t_changed = DiskCache.refresh_files(translation_paths, cached.get("translations", {}), AptIndex.parse_translations)
+            if p_changed or t_changed:
+                DiskCache.save(AptIndex.CACHE_NAME, AptIndex.CACHE_VERSION, {"packages": packages, "translations": translations})
+
+            merged = AptIndex.merge(packages, translations, AptPolicy.native_architecture(), AptPolicy.read_pins(pin_files))
+            names = sorted(merged)
+            index = SearchIndex()
+            for name in names:
+                index.add(name, merged[name][1])
+            index.build()
+            state = {"signature": signature, "names": names, "packages": merged, "index": index, "files": packages,
+                     "skipped": [p for p in package_paths if p not in packages]}
+            AptIndex._state = state
+            return state
+
+    @staticmethod
+    def skipped():
+        """Packages files the last load could not read (e.g. .lz4 lists without the lz4 tool)"""
+        state = AptIndex._state
+        return state["skipped"] if state is not None else []
+
+    @staticmethod
+    def search(query, offset=0, limit=PAGE_SIZE):
+        """Returns (one page of ranked results, total number of matches)"""
+        state = AptIndex.load()
+        # Runs in a search worker: every match is collected, the total counts them all
+        ranked = state["index"].search(query, budget=None)
+        results = []
+        for doc, score in ranked[offset:offset + limit]:
+            name = state["names"][doc]
+            version, summary = state["packages"][name]
+            results.append({"name": name, "description": summary, "type": "APT", "version": version, "install_date": "In repo", "score": score})
+        return results, len(ranked)
@@ -0,0 +1,180 @@
+import os
+import re
+import fnmatch
+from core.debversion import DebVersion
+from core.dpkg_status import DpkgStatus
+
+PREFERENCES_FILE = "/etc/apt/preferences"
+PREFERENCES_DIR = "/etc/apt/preferences.d"
+# Pin: release keys -> Release file fields
+RELEASE_KEYS = {"a": "Suite", "n": "Codename", "v": "Version", "o": "Origin", "l": "Label", "c": "Component", "b": "Architecture"}
+
+class AptPolicy:
+    """Native `apt list --upgradable`: installed versions from the dpkg status file against
+    candidates from the list index, chosen with apt's pin priority rules from /etc/apt/preferences*."""
+
+    @staticmethod
+    def native_architecture():
+        """dpkg's own architecture, which is the system's native one (None when dpkg is not installed)"""
+        return DpkgStatus.read_installed(("Architecture",), packages=["dpkg"]).get("dpkg", {}).get("Architecture")
+
+    @staticmethod
+    def preference_files():
+        files = [PREFERENCES_FILE] if os.path.isfile(PREFERENCES_FILE) else []
+        try:
+            names = sorted(os.listdir(PREFERENCES_DIR))
+        except OSError:
+            names = []
+        for name in names:
+            # apt ignores files with an extension other than .pref
+            if "." in name and not name.endswith(".pref"): continue
+            path = os.path.join(PREFERENCES_DIR, name)
+            if os.path.isfile(path): files.append(path)
+        return files
+
+    @staticmethod
+    def read_pins(files=None):
+        """[{"packages": [patterns], "pin": (kind, value), "priority": int}] in file order"""
+        pins = []
+        for path in files if files is not None else AptPolicy.preference_files():
+            try:
+                with open(path, "r", errors="replace") as f:
+                    text = f.read()
+            except OSError:
+                continue
+            for stanza in re.split(r"\n\s*\n", text):
+                fields = {}
+                for line in stanza.splitlines():
+                    if line.startswith("#") or ":" not in line: continue
+                    key, _, value = line.partition(":")
+                    fields[key.strip().lower()] = value.strip()
+                if "package" not in fields or "pin" not in fields: continue
+                try:
+                    priority = int(fields.get("pin-priority", ""))
+                except ValueError:
+                    continue
+                kind, _, value = fields["pin"].partition(" ")
+                pins.append({"packages": fields["package"].split(), "pin": (kind, value.strip()), "priority": priority})
+        # Records naming packages win over the general "Package: *" form
+        pins.sort(key=lambda pin: pin["packages"] == ["*"])
+        return pins
+
+    @staticmethod
+    def _match(pattern, value):
+        """apt pattern: /regex/, glob, or literal"""
+        if value is None: return False
+        if len(pattern) > 1 and pattern.startswith("/") and pattern.endswith("/"):
+            return re.search(pattern[1:-1], value) is not None
+        return fnmatch.fnmatchcase(value, pattern)
+
+    @staticmethod
+    def release_info(list_path):
+        """Origin fields of the archive a Packages file belongs to, read from its (In)Release file"""
+        name = os.path.basename(list_path)
+        info = {"Site": name.split("_", 1)[0], "NotAutomatic": "no", "ButAutomaticUpgrades": "no"}
+        m = re.search(r"_binary-([^_]+)_Packages", name)
+        if m: info["Architecture"] = m.group(1)
+        head, sep, tail = name.partition("_dists_")
+        if sep:
+            parts = tail.split("_")
+            # <suite parts...>_<component>_binary-<arch>_Packages; the suite may itself contain "_"
+            for i in range(len(parts) - 1, 0, -1):
+                prefix = os.path.join(os.path.dirname(list_path), head + "_dists_" + "_".join(parts[:i]))
+                release = next((prefix + s for s in ("_InRelease", "_Release") if os.path.exists(prefix + s)), None)
+                if release:
+                    info["Component"] = "_".join(p for p in parts[i:] if not p.startswith("binary-") and p != "Packages")
+                    AptPolicy._read_release(release, info)
+                    break
+        return info
+
+    @staticmethod
+    def _read_release(path, info):
+        try:
+            with open(path, "r", errors="replace") as f:
+                for line in f:
+                    # The checksum lists start with an indented block; everything needed comes before it
+                    if line.startswith(("MD5Sum:", "SHA1:", "SHA256:", "SHA512:")): break
+                    key, sep, value = line.partition(":")
+                    if sep and key in ("Origin", "Label", "Suite", "Codename", "Version", "NotAutomatic", "ButAutomaticUpgrades"):
+                        info[key] = value.strip()
+        except OSError: pass
+
+    @staticmethod
+    def default_priority(info):
+        if info.get("NotAutomatic") == "yes":
+            return 100 if info.get("ButAutomaticUpgrades") == "yes" else 1
+        return 500
+
+    @staticmethod
+    def _pin_matches(pin, name, version, info):
+        if not any(AptPolicy._match(p, name) for p in pin["packages"]):
+            return False
+        kind, value = pin["pin"]
+        if kind == "version":
+            return AptPolicy._match(value, version)
+        if kind == "origin":
+            return AptPolicy._match(value.strip('"'), info.get("Site", ""))
+        if kind == "release":
+            for term in value.split(","):
+                key, sep, want = term.strip().partition("=")
+                if not sep:
+                    # Pin: release <version> is shorthand for v=<version>
+                    key, want = "v", key
+                if not AptPolicy._match(want.strip('"'), info.get(RELEASE_KEYS.get(key, key))):
+                    return False
+            return True
+        return False
+
+    @staticmethod
+    def priority(pins, name, version, info, default=None):
+        """Priority of one version in one archive: the first matching pin, else the archive default"""
+        for pin in pins:
+            if AptPolicy._pin_matches(pin, name, version, info):
+                return pin["priority"]
+        return AptPolicy.default_priority(info) if default is None else default
+
+    @staticmethod
+    def candidate(installed, versions):
+        """apt's candidate: the highest-priority version, newest among equals, never a downgrade
+        below priority 1000 and never a version pinned below 0. `versions` is {version: priority}."""
+        best = None
+        for version, prio in versions.items():
+            if prio < 0: continue
+            if installed and prio < 1000 and version != installed and DebVersion.compare(version, installed) < 0:
+                continue
+            if best is None or prio > best[1] or (prio == best[1] and DebVersion.compare(version, best[0]) > 0):
+                best = (version, prio)
+        return best[0] if best else installed
+
+    @staticmethod
+    def upgradable(state):
+        """[{name, version, installed, type, description}] for every installed package whose candidate
+        differs, from the list index `state` (AptIndex.load())"""
+        installed = DpkgStatus.read_installed(("Version", "Architecture"))
+        pins = AptPolicy.read_pins()
+        versions = {}
+        for path, entry in state["files"].items():
+            info = AptPolicy.release_info(path)
+            default = AptPolicy.default_priority(info)
+            for name, version, _, _, arch in entry["data"]:
+                current = installed.get(name)
+                if current is None: continue
+                if arch not in ("all", current.get("Architecture", arch)): continue
+                prio = AptPolicy.priority(pins, name, version, info) if pins else default
+                known = versions.setdefault(name, {})
+                known[version] = max(prio, known.get(version, prio))
+
+        upgradable = []
+        status_info = {"Site": "", "Suite": "now"}
+        for name, entry in sorted(installed.items()):
+            available = versions.get(name)
+            if not available: continue
+            current = entry.get("Version")
+            # The installed copy also lives in the dpkg "now" archive, at priority 100 unless pinned
+            now = AptPolicy.priority(pins, name, current, status_info, default=100)
+            available[current] = max(available.get(current, now), now)
+            best = AptPolicy.candidate(current, available)
+            if best != current:
+                upgradable.append({"name": name, "version": best, "installed": current, "type": "APT",
+                                   "description": f"Update to {best} available"})
+        return upgradable
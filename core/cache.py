@@ -0,0 +1,61 @@
+import os
+import json
+from pathlib import Path
+
+class DiskCache:
+    """Versioned JSON documents under ~/.cache/linuxpkgmanager"""
+    cache_dir = Path.home() / ".cache" / "linuxpkgmanager"
+
+    @staticmethod
+    def path(name):
+        return DiskCache.cache_dir / name
+
+    @staticmethod
+    def load(name, version):
+        """Returns the cached payload, or None if missing, unreadable or written by another format version"""
+        try:
+            with open(DiskCache.path(name), "r") as f:
+                doc = json.load(f)
+            if doc.get("version") != version:
+                return None
+            return doc.get("data")
+        except: return None
+
+    @staticmethod
+    def save(name, version, data):
+        try:
+            DiskCache.cache_dir.mkdir(parents=True, exist_ok=True)
+            path = DiskCache.path(name)
+            tmp = path.with_suffix(path.suffix + ".tmp")
+            with open(tmp, "w") as f:
+                json.dump({"version": version, "data": data}, f)
+            # Atomic swap so a crash never leaves a truncated cache behind
+            os.replace(tmp, path)
+            return True
+        except: return False
+
+    @staticmethod
+    def stat_key(path):
+        """Cheap validator for a file or directory: [mtime_ns, size], or None if it does not exist"""
+        try:
+            st = os.stat(path)
+            return [st.st_mtime_ns, st.st_size]
+        except OSError:
+            return None
+
+    @staticmethod
+    def refresh_files(paths, cached, parse):
+        """Re-parses only the files whose stat_key changed since `cached` ({path: {"stat", "data"}}).
+        Returns (the refreshed mapping, whether anything changed); unreadable files are dropped."""
+        files, changed = {}, False
+        for path in paths:
+            stat = DiskCache.stat_key(path)
+            entry = cached.get(path)
+            if entry is None or entry["stat"] != stat:
+                try:
+                    entry = {"stat": stat, "data": parse(path)}
+                except Exception:
+                    continue
+                changed = True
+            files[path] = entry
+        return files, changed or set(cached) != set(files)
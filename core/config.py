@@ -6,7 +6,12 @@ class ConfigManager:
     DEFAULT_CONFIG = {
         "theme": "dark",
         "view_mode": "list",
-        "sort_by": "Name A-Z"
+        "sort_by": "Name A-Z",
+        "search_cache_ttl": 3600,
+        "search_cache_size": 200,
+        "updates_ttl": 21600,
+        "helper_launcher": "pkexec",
+        "helper_args": ""
     }
 
     def __init__(self):
@@ -0,0 +1,57 @@
+from functools import cmp_to_key
+
+class DebVersion:
+    """Debian version comparison, following dpkg's verrevcmp"""
+
+    @staticmethod
+    def parse(version):
+        """Splits a version into (epoch, upstream, revision)"""
+        # dpkg splits the epoch at the first colon (the upstream version may contain more) and the revision at the last hyphen
+        epoch, _, rest = version.partition(":") if ":" in version else ("0", "", version)
+        upstream, _, revision = rest.rpartition("-") if "-" in rest else (rest, "", "0")
+        try:
+            epoch = int(epoch or 0)
+        except ValueError:
+            epoch = 0
+        return epoch, upstream, revision or "0"
+
+    @staticmethod
+    def _order(c):
+        if c == "~": return -1
+        if c.isdigit(): return 0
+        if c.isalpha(): return ord(c)
+        return ord(c) + 256
+
+    @staticmethod
+    def _compare_part(a, b):
+        i = j = 0
+        while i < len(a) or j < len(b):
+            first_diff = 0
+            # Non-digit prefix, compared with ~ sorting before everything, even the end of the string
+            while (i < len(a) and not a[i].isdigit()) or (j < len(b) and not b[j].isdigit()):
+                ac = DebVersion._order(a[i]) if i < len(a) else 0
+                bc = DebVersion._order(b[j]) if j < len(b) else 0
+                if ac != bc: return ac - bc
+                i += 1
+                j += 1
+            while i < len(a) and a[i] == "0": i += 1
+            while j < len(b) and b[j] == "0": j += 1
+            while i < len(a) and a[i].isdigit() and j < len(b) and b[j].isdigit():
+                if not first_diff: first_diff = ord(a[i]) - ord(b[j])
+                i += 1
+                j += 1
+            if i < len(a) and a[i].isdigit(): return 1
+            if j < len(b) and b[j].isdigit(): return -1
+            if first_diff: return first_diff
+        return 0
+
+    @staticmethod
+    def compare(a, b):
+        """Negative, zero or positive as version `a` is older than, equal to or newer than `b`"""
+        if a == b: return 0
+        ae, au, ar = DebVersion.parse(a)
+        be, bu, br = DebVersion.parse(b)
+        if ae != be: return ae - be
+        return DebVersion._compare_part(au, bu) or DebVersion._compare_part(ar, br)
+
+    sort_key = staticmethod(cmp_to_key(lambda a, b: DebVersion.compare(a, b)))
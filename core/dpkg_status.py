@@ -0,0 +1,143 @@
+import os
+import mmap
+
+STATUS_FILE = "/var/lib/dpkg/status"
+EXTENDED_STATES_FILE = "/var/lib/apt/extended_states"
+INFO_DIR = "/var/lib/dpkg/info"
+# apt takes the frontend lock for a whole transaction, dpkg the inner one
+LOCK_FILES = ["/var/lib/dpkg/lock-frontend", "/var/lib/dpkg/lock"]
+PROC_LOCKS = "/proc/locks"
+
+class DpkgStatus:
+    """Native reader for the dpkg/apt control-file databases (no subprocesses)"""
+
+    @staticmethod
+    def _open(path):
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    @staticmethod
+    def _stanzas(mm):
+        """Yields (start, end) offsets of every stanza without copying it"""
+        pos, size = 0, len(mm)
+        while pos < size:
+            while pos < size and mm[pos] == 10:
+                pos += 1
+            if pos >= size: break
+            end = mm.find(b"\n\n", pos)
+            if end == -1: end = size
+            yield pos, end
+            pos = end + 2
+
+    @staticmethod
+    def _field(mm, start, end, key):
+        """Returns the first line of `key` inside a stanza (bytes), continuation lines are not materialised"""
+        tag = key + b":"
+        if mm[start:start + len(tag)] == tag:
+            idx = start
+        else:
+            idx = mm.find(b"\n" + tag, start, end)
+            if idx == -1: return None
+            idx += 1
+        vstart = idx + len(tag)
+        vend = mm.find(b"\n", vstart, end)
+        if vend == -1: vend = end
+        return mm[vstart:vend].strip()
+
+    @staticmethod
+    def read_stanzas(path, fields, packages=None, installed_only=False):
+        """Returns {name: {field: value}} for the stanzas of a control file.
+        Only `fields` are decoded, and only for `packages` when a filter is given."""
+        result = {}
+        try:
+            mm = DpkgStatus._open(path)
+        except OSError:
+            return result
+        if mm is None: return result
+        keys = [(f, f.encode()) for f in fields]
+        wanted = {p.encode() for p in packages} if packages is not None else None
+        try:
+            for start, end in DpkgStatus._stanzas(mm):
+                name = DpkgStatus._field(mm, start, end, b"Package")
+                if not name: continue
+                if wanted is not None and name not in wanted: continue
+                if installed_only:
+                    status = DpkgStatus._field(mm, start, end, b"Status")
+                    if not status or status.rsplit(b" ", 1)[-1] != b"installed": continue
+                entry = {}
+                for field, key in keys:
+                    value = DpkgStatus._field(mm, start, end, key)
+                    if value is not None:
+                        entry[field] = value.decode("utf-8", "replace")
+                # Multi-arch packages have one stanza per architecture, keep the first
+                result.setdefault(name.decode("utf-8", "replace"), entry)
+        finally:
+            mm.close()
+        return result
+
+    @staticmethod
+    def read_installed(fields=(), packages=None, path=STATUS_FILE):
+        return DpkgStatus.read_stanzas(path, fields, packages, installed_only=True)
+
+    @staticmethod
+    def read_auto_installed(path=EXTENDED_STATES_FILE):
+        """Names flagged Auto-Installed: 1 in apt's extended_states"""
+        states = DpkgStatus.read_stanzas(path, ("Auto-Installed",))
+        return {name for name, entry in states.items() if entry.get("Auto-Installed") == "1"}
+
+    @staticmethod
+    def read_manual(installed=None):
+        """Equivalent of `apt-mark showmanual`: installed packages that are not auto-installed"""
+        if installed is None:
+            installed = DpkgStatus.read_installed()
+        auto = DpkgStatus.read_auto_installed()
+        return {name for name in installed if name not in auto}
+
+    @staticmethod
+    def read_install_timestamps(info_dir=INFO_DIR):
+        """Equivalent of ${db-fsys:Last-Modified}: mtime of each package's .list file"""
+        timestamps = {}
+        try:
+            with os.scandir(info_dir) as it:
+                for entry in it:
+                    if not entry.name.endswith(".list"): continue
+                    name = entry.name[:-5].split(':')[0]
+                    try:
+                        ts = int(entry.stat().st_mtime)
+                    except OSError:
+                        continue
+                    timestamps[name] = max(ts, timestamps.get(name, 0))
+        except OSError: pass
+        return timestamps
+
+    @staticmethod
+    def lock_holder(lock_files=LOCK_FILES, proc_locks=PROC_LOCKS):
+        """(pid, command) of a process holding a dpkg lock, else None. Read from /proc/locks,
+        which needs no privileges (the lock files themselves are only readable by root)."""
+        ids = set()
+        for path in lock_files:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            ids.add(f"{os.major(st.st_dev):02x}:{os.minor(st.st_dev):02x}:{st.st_ino}")
+        if not ids: return None
+        try:
+            with open(proc_locks, "r") as f:
+                lines = f.readlines()
+        except OSError:
+            return None
+        for line in lines:
+            # "1: POSIX  ADVISORY  WRITE 1234 08:02:131090 0 EOF"; blocked waiters are marked "->"
+            parts = line.split()
+            if len(parts) < 6 or parts[1] == "->" or parts[5] not in ids: continue
+            pid = int(parts[4]) if parts[4].isdigit() else 0
+            try:
+                with open(f"/proc/{pid}/comm", "r") as f:
+                    command = f.read().strip()
+            except OSError:
+                command = "another package manager"
+            return pid, command
+        return None
@@ -1,80 +1,90 @@
 import subprocess
 import os
+from pathlib import Path
+from core.icon_index import IconIndex
+from core.process import Process
 
 class FlatpakBackend:
     @staticmethod
     def is_available():
         return os.path.exists("/usr/bin/flatpak")
 
+    @staticmethod
+    def installation_dirs():
+        """System-wide and per-user installation roots"""
+        return [Path("/var/lib/flatpak"), Path.home() / ".local" / "share" / "flatpak"]
+
     @staticmethod
     def get_installed():
         apps = []
         if not FlatpakBackend.is_available(): return apps
-        try:
-            # flatpak list --app --columns=name,application,version,size,origin
-            res = subprocess.check_output([
-                "flatpak", "list", "--app", 
-                "--columns=name,application,version,size,origin"
-            ], text=True)
-            lines = res.splitlines()
-            for line in lines:
-                parts = line.split('	')
-                if len(parts) >= 5:
-                    name, app_id, version, size, origin = parts[0], parts[1], parts[2], parts[3], parts[4]
-                    apps.append({
-                        "name": name,
-                        "id": app_id,
-                        "version": version,
-                        "size": size,
-                        "origin": origin,
-                        "description": f"Flatpak from {origin} ({size})",
-                        "type": "Flatpak",
-                        "install_date": "Installed via Flatpak"
-                    })
-        except: pass
+        # flatpak list --app --columns=name,application,version,size,origin
+        res = subprocess.check_output([
+            "flatpak", "list", "--app", 
+            "--columns=name,application,version,size,origin"
+        ], text=True)
+        lines = res.splitlines()
+        icons = IconIndex.get()
+        for line in lines:
+            parts = line.split('	')
+            if len(parts) >= 5:
+                name, app_id, version, size, origin = parts[0], parts[1], parts[2], parts[3], parts[4]
+                apps.append({
+                    "name": name,
+                    "id": app_id,
+                    "version": version,
+                    "size": size,
+                    "origin": origin,
+                    "description": f"Flatpak from {origin} ({size})",
+                    "icon": FlatpakBackend.find_icon(app_id, icons),
+                    "type": "Flatpak",
+                    "install_date": "Installed via Flatpak"
+                })
         return apps
 
     @staticmethod
-    def get_upgradable():
+    def find_icon(app_id, index=None):
+        # Exported icons and .desktop files are named after the app id, which the shared index covers
+        return IconIndex.find(app_id, index)
+
+    @staticmethod
+    def get_upgradable(timeout=None, token=None):
         upgradable = []
         if not FlatpakBackend.is_available(): return upgradable
-        try:
-            # flatpak remote-ls --updates
-            res = subprocess.check_output(["flatpak", "remote-ls", "--updates", "--columns=name,application,version"], text=True)
-            lines = res.splitlines()
-            for line in lines:
-                parts = line.split('	')
-                if len(parts) >= 3:
-                    upgradable.append({
-                        "name": parts[0],
-                        "id": parts[1],
-                        "version": parts[2],
-                        "type": "Flatpak",
-                        "description": f"Update to {parts[2]} available"
-                    })
-        except: pass
+        # Failures (offline, no remote) propagate: they must not be cached as "no updates"
+        res = Process.check_output(["flatpak", "remote-ls", "--updates", "--columns=name,application,version"], timeout, token)
+        lines = res.splitlines()
+        for line in lines:
+            parts = line.split('	')
+            if len(parts) >= 3:
+                upgradable.append({
+                    "name": parts[0],
+                    "id": parts[1],
+                    "version": parts[2],
+                    "type": "Flatpak",
+                    "description": f"Update to {parts[2]} available"
+                })
         return upgradable
 
     @staticmethod
-    def search_flatpaks(query):
+    def search_flatpaks(query, timeout=None, token=None):
         results = []
         if not query or not FlatpakBackend.is_available(): return results
-        try:
-            res = subprocess.check_output([
-                "flatpak", "search", query, 
-                "--columns=name,application,version,description"
-            ], text=True)
-            lines = res.splitlines()
-            for line in lines[:50]:
-                parts = line.split('	')
-                if len(parts) >= 4:
-                    results.append({
-                        "name": parts[0],
-                        "id": parts[1],
-                        "version": parts[2],
-                        "description": parts[3],
-                        "type": "Flatpak",
-                        "install_date": f"ID: {parts[1]}"
-                    })
-        except: pass
+        # Failures propagate: an empty answer is cached, and must mean "no matches"
+        res = Process.check_output([
+            "flatpak", "search", query, 
+            "--columns=name,application,version,description"
+        ], timeout, token)
+        lines = res.splitlines()
+        for line in lines[:50]:
+            parts = line.split('	')
+            if len(parts) >= 4:
+                results.append({
+                    "name": parts[0],
+                    "id": parts[1],
+                    "version": parts[2],
+                    "description": parts[3],
+                    "type": "Flatpak",
+                    "install_date": f"ID: {parts[1]}"
+                })
         return results
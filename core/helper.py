@@ -0,0 +1,232 @@
+"""Privileged helper: started once per session through pkexec, it runs a fixed set of validated
+package operations for the one user that started it, over a Unix socket.
+
+Protocol: JSON lines. A connection carries one request, {"op": ..., "args": {...}}. The helper
+answers with {"event": "stdout"|"stderr", "text": ...} for every output line, then
+{"event": "exit", "code": n}, or with {"event": "error", "message": ...} when the request is
+refused. {"op": "cancel"} sent on the same connection kills the running operation. Besides the
+package operations there are "ping" and "shutdown".
+
+The helper never receives a command line: argv is built here from the operation name and its
+checked arguments. Only stdlib imports, since it runs as root outside the application."""
+import argparse
+import json
+import os
+import re
+import selectors
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+
+SOURCES_DIR = "/etc/apt/sources.list.d"
+SAFE_PATH = "/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin"
+# Seconds without any request before the helper exits on its own
+IDLE_TIMEOUT = 900
+PACKAGE_NAME = re.compile(r"^[a-z0-9][a-z0-9+.\-]*(:[a-z0-9\-]+)?$")
+SNAP_NAME = re.compile(r"^[a-z0-9][a-z0-9\-]*(_[a-z0-9]+)?$")
+FLATPAK_REF = re.compile(r"^[A-Za-z0-9_][A-Za-z0-9_\-]*(\.[A-Za-z0-9_\-]+)+(/([A-Za-z0-9_][A-Za-z0-9_.\-]*)?){0,3}$")
+SOURCE_FILE = re.compile(r"^[A-Za-z0-9_.+\-]+\.(list|sources)(\.disabled)?$")
+LANG = re.compile(r"^[A-Za-z0-9_.@\-]+$")
+
+class HelperOps:
+    """The operations the helper accepts; build() returns argv or raises ValueError"""
+
+    @staticmethod
+    def _names(args, key, pattern):
+        names = args.get(key)
+        if not isinstance(names, list) or not names:
+            raise ValueError(f"'{key}' must be a non-empty list")
+        for name in names:
+            if not isinstance(name, str) or not pattern.match(name):
+                raise ValueError(f"invalid name: {name!r}")
+        return names
+
+    @staticmethod
+    def _apt(*args):
+        # Progress on stdout (APT::Status-Fd), and apt waits should another frontend hold the lock.
+        # Validated names never start with "-", so they cannot be taken for options.
+        return ["apt-get", "-o", "APT::Status-Fd=1", "-o", "DPkg::Lock::Timeout=300"] + list(args)
+
+    @staticmethod
+    def _source(args):
+        source = args.get("source")
+        if not isinstance(source, str) or not source or len(source) > 512 or source.startswith("-") \
+                or any(c in source for c in "\n\r\0"):
+            raise ValueError("invalid repository")
+        return source
+
+    @staticmethod
+    def build(op, args):
+        names = HelperOps._names
+        if op == "apt_install":
+            upgrade = ["--only-upgrade"] if args.get("upgrade") else []
+            return HelperOps._apt("install", "-y", *upgrade, *names(args, "packages", PACKAGE_NAME))
+        if op == "apt_install_deb":
+            path = args.get("path")
+            if not isinstance(path, str) or not os.path.isabs(path) or not path.endswith(".deb") or not os.path.isfile(path):
+                raise ValueError("not a .deb file")
+            return HelperOps._apt("install", "-y", os.path.normpath(path))
+        if op == "apt_remove":
+            return HelperOps._apt("remove", "--purge", "-y", *names(args, "packages", PACKAGE_NAME))
+        if op == "apt_autoremove":
+            return HelperOps._apt("autoremove", "-y")
+        if op == "apt_clean":
+            return HelperOps._apt("clean")
+        if op in ("snap_install", "snap_refresh", "snap_remove"):
+            # --no-wait: the change id is printed and its progress read from snapd
+            return ["snap", op[5:], "--no-wait", "--", *names(args, "packages", SNAP_NAME)]
+        if op in ("flatpak_install", "flatpak_update", "flatpak_uninstall"):
+            return ["flatpak", op[8:], "-y", "--noninteractive", "--", *names(args, "refs", FLATPAK_REF)]
+        if op == "ppa_add":
+            return ["add-apt-repository", "-y", "--", HelperOps._source(args)]
+        if op == "ppa_remove":
+            return ["add-apt-repository", "--remove", "-y", "--", HelperOps._source(args)]
+        if op == "source_toggle":
+            name = args.get("file")
+            if not isinstance(name, str) or not SOURCE_FILE.match(name):
+                raise ValueError("invalid sources file")
+            new = name.removesuffix(".disabled") if args.get("enable") else name.removesuffix(".disabled") + ".disabled"
+            return ["mv", "--", os.path.join(SOURCES_DIR, name), os.path.join(SOURCES_DIR, new)]
+        raise ValueError(f"unknown operation: {op!r}")
+
+class Helper:
+    def __init__(self, address, uid, parent, dry_run=False):
+        self.address = address
+        self.uid = uid
+        self.parent = parent
+        self.dry_run = dry_run
+        self.active = 0
+        self.last_request = time.monotonic()
+        self.lock = threading.Lock()
+        self.stopping = False
+
+    def env(self, lang):
+        # Root gets a fixed environment; an unprivileged stand-in keeps its PATH (tests use it)
+        env = {"PATH": SAFE_PATH if os.geteuid() == 0 else os.environ.get("PATH", SAFE_PATH),
+               "DEBIAN_FRONTEND": "noninteractive"}
+        if isinstance(lang, str) and LANG.match(lang):
+            env["LANG"] = lang
+        return env
+
+    @staticmethod
+    def send(conn, message):
+        try:
+            conn.sendall(json.dumps(message).encode() + b"\n")
+            return True
+        except OSError:
+            return False
+
+    @staticmethod
+    def peer_uid(conn):
+        creds = conn.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+        return struct.unpack("3i", creds)[1]
+
+    def serve(self):
+        server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        server.bind(self.address)
+        server.listen(8)
+        server.settimeout(1)
+        while not self.stopping:
+            # Gone with the application that started it, or after a long idle spell
+            if os.getppid() != self.parent: break
+            with self.lock:
+                if self.active == 0 and time.monotonic() - self.last_request > IDLE_TIMEOUT: break
+            try:
+                conn, _ = server.accept()
+            except socket.timeout:
+                continue
+            if self.peer_uid(conn) != self.uid:
+                conn.close()
+                continue
+            threading.Thread(target=self.handle, args=(conn,), daemon=True).start()
+        server.close()
+
+    def handle(self, conn):
+        with self.lock:
+            self.active += 1
+            self.last_request = time.monotonic()
+        try:
+            reader = conn.makefile("rb")
+            line = reader.readline()
+            try:
+                request = json.loads(line)
+                op, args = request.get("op"), request.get("args") or {}
+                if op == "ping":
+                    self.send(conn, {"event": "exit", "code": 0})
+                    return
+                if op == "shutdown":
+                    self.stopping = True
+                    self.send(conn, {"event": "exit", "code": 0})
+                    return
+                argv = HelperOps.build(op, args)
+            except (ValueError, AttributeError) as e:
+                self.send(conn, {"event": "error", "message": str(e)})
+                return
+            if self.dry_run:
+                self.send(conn, {"event": "stdout", "text": "would run: " + " ".join(argv)})
+                self.send(conn, {"event": "exit", "code": 0})
+                return
+            self.run(conn, argv, self.env(request.get("lang")))
+        finally:
+            with self.lock:
+                self.active -= 1
+                self.last_request = time.monotonic()
+            conn.close()
+
+    def run(self, conn, argv, env):
+        try:
+            proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL,
+                                    env=env, start_new_session=True)
+        except OSError as e:
+            self.send(conn, {"event": "error", "message": str(e)})
+            return
+        streams = {proc.stdout: "stdout", proc.stderr: "stderr"}
+        buffers = {proc.stdout: b"", proc.stderr: b""}
+        connected = True
+        with selectors.DefaultSelector() as sel:
+            for pipe in streams:
+                os.set_blocking(pipe.fileno(), False)
+                sel.register(pipe, selectors.EVENT_READ)
+            sel.register(conn, selectors.EVENT_READ)
+            while any(k.fileobj in streams for k in sel.get_map().values()):
+                for key, _ in sel.select():
+                    if key.fileobj is conn:
+                        data = conn.recv(4096)
+                        if not data:
+                            # The client went away: the operation finishes unobserved, never half done
+                            sel.unregister(conn)
+                            connected = False
+                        elif b'"cancel"' in data:
+                            try:
+                                os.killpg(proc.pid, signal.SIGKILL)
+                            except OSError: pass
+                        continue
+                    pipe = key.fileobj
+                    chunk = os.read(pipe.fileno(), 65536)
+                    if not chunk:
+                        sel.unregister(pipe)
+                        lines = [buffers.pop(pipe)]
+                    else:
+                        *lines, buffers[pipe] = re.split(rb"[\r\n]", buffers[pipe] + chunk)
+                    for line in lines:
+                        text = line.decode("utf-8", "replace").strip()
+                        if text and connected:
+                            connected = self.send(conn, {"event": streams[pipe], "text": text})
+        proc.wait()
+        self.send(conn, {"event": "exit", "code": proc.returncode})
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", required=True, help="abstract socket name to listen on")
+    parser.add_argument("--uid", type=int, required=True, help="the only user allowed to connect")
+    parser.add_argument("--parent", type=int, required=True, help="exit when this process is gone")
+    parser.add_argument("--dry-run", action="store_true", help="report the commands instead of running them")
+    opts = parser.parse_args()
+    Helper("\0" + opts.socket, opts.uid, opts.parent, opts.dry_run).serve()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,138 @@
+import os
+import sys
+import json
+import time
+import socket
+import struct
+import secrets
+import threading
+import subprocess
+from core.config import config
+from core.process import Cancelled
+from core.helper import HelperOps
+
+HELPER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "helper.py")
+
+class HelperError(Exception):
+    """The helper could not be started or refused a request"""
+
+class HelperClient:
+    """Client of the privileged helper (core/helper.py). The helper is started on first use with
+    `helper_launcher` (pkexec: one authorisation for the whole session) and reached over an
+    abstract Unix socket; an empty launcher runs it unprivileged, as a stand-in for testing, and
+    `helper_args` is passed on to it ("--dry-run" reports the commands instead of running them)."""
+    # Seconds to wait for the helper to come up, password dialog included
+    START_TIMEOUT = 120
+    _lock = threading.Lock()
+    _proc = None
+    _name = None
+
+    @staticmethod
+    def launcher():
+        launcher = config.get("helper_launcher")
+        return launcher.split() if launcher else []
+
+    @staticmethod
+    def helper_args():
+        args = config.get("helper_args")
+        return args.split() if args else []
+
+    @staticmethod
+    def _connect():
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.connect("\0" + HelperClient._name)
+            # Anyone can bind an abstract name: only trust root, or ourselves when running the stand-in
+            creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+            uid = struct.unpack("3i", creds)[1]
+            if uid != 0 and (HelperClient.launcher() or uid != os.getuid()):
+                raise HelperError(f"helper socket owned by uid {uid}")
+        except Exception:
+            sock.close()
+            raise
+        return sock
+
+    @staticmethod
+    def ensure_running():
+        """Starts the helper unless it is up; the launcher asks for authorisation here, once"""
+        with HelperClient._lock:
+            proc = HelperClient._proc
+            if proc is not None and proc.poll() is None:
+                return
+            HelperClient._name = f"linuxpkgmanager-helper-{os.getuid()}-{secrets.token_hex(8)}"
+            cmd = HelperClient.launcher() + [sys.executable, HELPER_PATH, "--socket", HelperClient._name,
+                                             "--uid", str(os.getuid()), "--parent", str(os.getpid())] + HelperClient.helper_args()
+            proc = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            deadline = time.monotonic() + HelperClient.START_TIMEOUT
+            while True:
+                if proc.poll() is not None:
+                    # pkexec exits 126 when the dialog is dismissed, 127 when not authorised
+                    raise HelperError("Authorisation was refused" if proc.returncode in (126, 127) else f"helper exited with code {proc.returncode}")
+                try:
+                    HelperClient._connect().close()
+                    break
+                except (OSError, HelperError):
+                    if time.monotonic() > deadline:
+                        proc.kill()
+                        raise HelperError("helper did not start")
+                    time.sleep(0.1)
+            HelperClient._proc = proc
+
+    @staticmethod
+    def run(op, args, on_line, token=None, on_error=None):
+        """Runs one helper operation: stdout lines go to on_line and stderr lines to on_error (or
+        on_line) as the helper streams them; returns the exit code. Raises HelperError, Cancelled."""
+        try:
+            # Requests the helper would refuse fail here, before anyone is asked for a password
+            HelperOps.build(op, args)
+        except ValueError as e:
+            raise HelperError(str(e))
+        if token is not None: token.check()
+        HelperClient.ensure_running()
+        sock = HelperClient._connect()
+
+        def cancel():
+            try:
+                sock.sendall(json.dumps({"op": "cancel"}).encode() + b"\n")
+            except OSError: pass
+
+        try:
+            sock.sendall(json.dumps({"op": op, "args": args, "lang": os.environ.get("LANG")}).encode() + b"\n")
+            if token is not None: token.on_cancel(cancel)
+            for line in sock.makefile("rb"):
+                message = json.loads(line)
+                event = message.get("event")
+                if event == "stdout":
+                    on_line(message["text"])
+                elif event == "stderr":
+                    (on_error or on_line)(message["text"])
+                elif event == "error":
+                    raise HelperError(message["message"])
+                elif event == "exit":
+                    if token is not None: token.check()
+                    return message["code"]
+            raise HelperError("connection to the helper was lost")
+        finally:
+            if token is not None: token.remove_callback(cancel)
+            sock.close()
+
+    @staticmethod
+    def call(op, args):
+        """Blocking run with the output discarded; True on success"""
+        try:
+            return HelperClient.run(op, args, lambda line: None) == 0
+        except (HelperError, Cancelled, OSError):
+            return False
+
+    @staticmethod
+    def shutdown():
+        with HelperClient._lock:
+            proc = HelperClient._proc
+            HelperClient._proc = None
+        if proc is None or proc.poll() is not None: return
+        try:
+            sock = HelperClient._connect()
+            sock.sendall(json.dumps({"op": "shutdown"}).encode() + b"\n")
+            sock.recv(4096)
+            sock.close()
+        except (OSError, HelperError): pass
@@ -0,0 +1,148 @@
+import os
+import threading
+from pathlib import Path
+from core.cache import DiskCache
+
+ICON_EXTENSIONS = (".png", ".svg", ".xpm")
+# Same preference as the old per-package probes, then everything else largest first
+PREFERRED_SIZES = ["48x48", "64x64", "scalable"]
+
+class IconIndex:
+    """Name -> icon file map built in one scandir sweep over the icon and .desktop directories.
+    Rebuilt only when one of the scanned directories' mtime changes."""
+    CACHE_NAME = "icon_index.json"
+    CACHE_VERSION = 1
+    _index = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def theme_roots():
+        return [
+            "/usr/share/icons/hicolor",
+            "/var/lib/flatpak/exports/share/icons/hicolor",
+            str(Path.home() / ".local" / "share" / "flatpak" / "exports" / "share" / "icons" / "hicolor"),
+        ]
+
+    @staticmethod
+    def desktop_dirs():
+        return [
+            "/usr/share/applications",
+            "/var/lib/snapd/desktop/applications",
+            "/var/lib/flatpak/exports/share/applications",
+            str(Path.home() / ".local" / "share" / "flatpak" / "exports" / "share" / "applications"),
+            str(Path.home() / ".local" / "share" / "applications"),
+        ]
+
+    @staticmethod
+    def icon_dirs():
+        """Icon directories in lookup priority order"""
+        dirs = ["/usr/share/pixmaps"]
+        for root in IconIndex.theme_roots():
+            try:
+                sizes = [e.name for e in os.scandir(root) if e.is_dir()]
+            except OSError:
+                continue
+
+            def rank(size):
+                if size in PREFERRED_SIZES: return (0, PREFERRED_SIZES.index(size))
+                try: return (1, -int(size.split("x")[0]))
+                except ValueError: return (2, 0)
+
+            dirs.extend(os.path.join(root, size, "apps") for size in sorted(sizes, key=rank))
+        dirs.append("/var/lib/snapd/desktop/icons")
+        return dirs
+
+    @staticmethod
+    def signature(icon_dirs):
+        paths = IconIndex.theme_roots() + icon_dirs + IconIndex.desktop_dirs()
+        return [[p, DiskCache.stat_key(p)] for p in paths]
+
+    @staticmethod
+    def _icon_keys(stem):
+        """Names an icon file answers to; snapd stores them as snap.<name>.<icon> or <name>_icon"""
+        keys = [stem]
+        if stem.startswith("snap."):
+            keys.append(stem.split(".")[1])
+        if stem.endswith("_icon"):
+            keys.append(stem[:-5])
+        return keys
+
+    @staticmethod
+    def _read_desktop(path):
+        icon = exec_name = None
+        try:
+            with open(path, "r", errors="replace") as f:
+                in_entry = False
+                for line in f:
+                    if line.startswith("["):
+                        # Icon=/Exec= of [Desktop Action ...] groups must not override the main entry
+                        if in_entry: break
+                        in_entry = line.startswith("[Desktop Entry]")
+                        continue
+                    if not in_entry: continue
+                    if icon is None and line.startswith("Icon="):
+                        icon = line[5:].strip()
+                    elif exec_name is None and line.startswith("Exec="):
+                        parts = line[5:].split()
+                        if parts: exec_name = os.path.basename(parts[0])
+        except OSError: pass
+        return icon, exec_name
+
+    @staticmethod
+    def build(icon_dirs=None):
+        if icon_dirs is None:
+            icon_dirs = IconIndex.icon_dirs()
+        files = {}
+        for d in icon_dirs:
+            try:
+                with os.scandir(d) as it:
+                    found = [(os.path.splitext(e.name), e.path) for e in it]
+            except OSError: continue
+            # Within a directory prefer png, then svg, then xpm
+            found = [f for f in found if f[0][1].lower() in ICON_EXTENSIONS]
+            found.sort(key=lambda f: ICON_EXTENSIONS.index(f[0][1].lower()))
+            for (stem, _), path in found:
+                for key in IconIndex._icon_keys(stem):
+                    files.setdefault(key, path)
+
+        desktop = {}
+        for d in IconIndex.desktop_dirs():
+            try:
+                entries = sorted((e for e in os.scandir(d) if e.name.endswith(".desktop")), key=lambda e: e.name)
+            except OSError:
+                continue
+            for entry in entries:
+                icon, exec_name = IconIndex._read_desktop(entry.path)
+                if not icon: continue
+                if os.path.isabs(icon):
+                    path = icon if os.path.exists(icon) else None
+                else:
+                    path = files.get(icon) or files.get(os.path.splitext(icon)[0])
+                if not path: continue
+                stem = entry.name[:-8]
+                # vlc.desktop, firefox_firefox.desktop (snap), org.gimp.GIMP.desktop (flatpak id), Exec=code
+                for key in (stem, stem.split("_")[0], exec_name):
+                    if key: desktop.setdefault(key, path)
+
+        return {"signature": IconIndex.signature(icon_dirs), "files": files, "desktop": desktop}
+
+    @staticmethod
+    def get():
+        with IconIndex._lock:
+            icon_dirs = IconIndex.icon_dirs()
+            signature = IconIndex.signature(icon_dirs)
+            index = IconIndex._index
+            if index is None or index["signature"] != signature:
+                index = DiskCache.load(IconIndex.CACHE_NAME, IconIndex.CACHE_VERSION)
+                if not index or index.get("signature") != signature:
+                    index = IconIndex.build(icon_dirs)
+                    DiskCache.save(IconIndex.CACHE_NAME, IconIndex.CACHE_VERSION, index)
+                IconIndex._index = index
+            return index
+
+    @staticmethod
+    def find(name, index=None):
+        """Icon path for a package, snap or flatpak app id, or None"""
+        if index is None:
+            index = IconIndex.get()
+        return index["files"].get(name) or index["desktop"].get(name)
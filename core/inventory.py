@@ -0,0 +1,135 @@
+import os
+from pathlib import Path
+from core.cache import DiskCache
+from core.dpkg_status import STATUS_FILE, EXTENDED_STATES_FILE
+from core.apt_backend import AptBackend
+from core.snap_backend import SnapBackend
+from core.flatpak_backend import FlatpakBackend
+from core.appimage_backend import AppImageBackend
+
+class Inventory:
+    """Merged installed-package list, cached on disk per backend and revalidated with cheap stat() checks"""
+    CACHE_NAME = "inventory.json"
+    CACHE_VERSION = 2
+    BACKENDS = ("APT", "Snap", "Flatpak", "AppImage")
+
+    @staticmethod
+    def validator(backend):
+        if backend == "APT":
+            return [DiskCache.stat_key(STATUS_FILE), DiskCache.stat_key(EXTENDED_STATES_FILE)]
+        if backend == "Snap":
+            return [DiskCache.stat_key(SnapBackend.STATE_FILE), DiskCache.stat_key("/snap")]
+        if backend == "Flatpak":
+            key = []
+            for root in FlatpakBackend.installation_dirs():
+                app_dir = root / "app"
+                key.append(DiskCache.stat_key(app_dir))
+                # Updates only swap the "current" symlink, which does not touch app/'s mtime
+                try:
+                    with os.scandir(app_dir) as it:
+                        for entry in sorted(it, key=lambda e: e.name):
+                            key.append([entry.name, DiskCache.stat_key(os.path.join(entry.path, "current"))])
+                except OSError: pass
+            return key
+        if backend == "AppImage":
+            return [DiskCache.stat_key(d) for d in AppImageBackend.scan_dirs()]
+        return None
+
+    @staticmethod
+    def watch_paths(backend):
+        """The files and directories whose changes move the backend's validator"""
+        if backend == "APT":
+            return [STATUS_FILE, EXTENDED_STATES_FILE]
+        if backend == "Snap":
+            return [SnapBackend.STATE_FILE, "/snap"]
+        if backend == "Flatpak":
+            paths = []
+            for root in FlatpakBackend.installation_dirs():
+                app_dir = root / "app"
+                paths.append(str(app_dir))
+                # One level down, where the "current" symlinks are swapped
+                try:
+                    with os.scandir(app_dir) as it:
+                        paths.extend(entry.path for entry in it if entry.is_dir())
+                except OSError: pass
+            return paths
+        if backend == "AppImage":
+            return [str(d) for d in AppImageBackend.scan_dirs()]
+        return []
+
+    @staticmethod
+    def collect(backend):
+        """Scans one backend from scratch; raises on failure so callers can report it per backend"""
+        if backend == "APT":
+            timestamps = AptBackend.get_install_timestamps()
+            manual = AptBackend.get_manual_list(timestamps)
+            return AptBackend.get_package_details(manual, timestamps)
+        if backend == "Snap":
+            return SnapBackend.get_snaps() if SnapBackend.is_available() else []
+        if backend == "Flatpak":
+            return FlatpakBackend.get_installed() if FlatpakBackend.is_available() else []
+        if backend == "AppImage":
+            return AppImageBackend.get_appimages()
+        return []
+
+    @staticmethod
+    def key(pkg):
+        """How jobs name a package: the file of an AppImage, the application id of a Flatpak"""
+        return pkg.get("path") or pkg.get("id") or pkg["name"]
+
+    @staticmethod
+    def collect_some(backend, keys):
+        """Re-reads only `keys` from one backend: the entries of those still installed"""
+        if backend == "APT":
+            timestamps = AptBackend.get_install_timestamps()
+            return AptBackend.get_package_details(AptBackend.get_manual_list(timestamps, keys), timestamps)
+        if backend == "AppImage":
+            return [AppImageBackend.entry(Path(k)) for k in keys if os.path.isfile(k)]
+        # snap and flatpak list everything in one call, no cheaper per package
+        return [p for p in Inventory.collect(backend) if Inventory.key(p) in keys]
+
+    @staticmethod
+    def patch(backend, keys, cached):
+        """Returns the backend's slice with the entries for `keys` re-read, the others kept as cached"""
+        if backend == "APT":
+            keys = {k.split(":")[0] for k in keys}
+        elif backend == "Flatpak":
+            # A ref (org.gimp.GIMP/x86_64/stable) is listed under its application id
+            keys = {k.split("/")[0] for k in keys}
+        # Taken before reading, so a change racing with the read still invalidates the slice
+        validator = Inventory.validator(backend)
+        fresh = {Inventory.key(p): p for p in Inventory.collect_some(backend, keys)}
+        packages = []
+        for pkg in cached.get("packages", []):
+            key = Inventory.key(pkg)
+            if key not in keys:
+                packages.append(pkg)
+            elif key in fresh:
+                packages.append(fresh.pop(key))
+        packages.extend(fresh.values())
+        return {"validator": validator, "packages": packages}
+
+    @staticmethod
+    def load_cached():
+        """Returns {backend: {"validator": ..., "packages": [...]}} from the last run, or {}"""
+        slices = DiskCache.load(Inventory.CACHE_NAME, Inventory.CACHE_VERSION)
+        return slices if isinstance(slices, dict) else {}
+
+    @staticmethod
+    def merge(slices):
+        pkgs = []
+        for backend in Inventory.BACKENDS:
+            pkgs.extend(slices.get(backend, {}).get("packages", []))
+        return pkgs
+
+    @staticmethod
+    def refresh_backend(backend, cached=None):
+        """Returns (slice, changed) for one backend, re-scanning it only if its validator moved"""
+        key = Inventory.validator(backend)
+        if cached and cached.get("validator") == key:
+            return cached, False
+        return {"validator": key, "packages": Inventory.collect(backend)}, True
+
+    @staticmethod
+    def save(slices):
+        return DiskCache.save(Inventory.CACHE_NAME, Inventory.CACHE_VERSION, slices)
@@ -0,0 +1,82 @@
+import os
+import time
+from PyQt6.QtCore import QObject, QTimer, QFileSystemWatcher, QCoreApplication, pyqtSignal
+from core.inventory import Inventory
+
+class InventoryWatcher(QObject):
+    """Notices packages installed behind the application's back (a terminal, unattended-upgrades,
+    snapd's auto-refresh) and reports which backends moved. Bursts of events are coalesced, and a
+    backend is only reported once its validator really changed. Paths that cannot be watched
+    (missing, or out of inotify watches) are polled instead."""
+    # Quiet period after the last event, and the longest a busy backend waits regardless
+    DEBOUNCE = 2000
+    MAX_DELAY = 15000
+    POLL_INTERVAL = 30000
+    backendsChanged = pyqtSignal(list)
+    _instance = None
+
+    @staticmethod
+    def instance():
+        if InventoryWatcher._instance is None:
+            InventoryWatcher._instance = InventoryWatcher(QCoreApplication.instance())
+        return InventoryWatcher._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.paths = {}
+        self.polled = set()
+        self.dirty = set()
+        self.first_event = None
+        self.validators = {b: Inventory.validator(b) for b in Inventory.BACKENDS}
+        self.watcher = QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(self.on_path_changed)
+        self.watcher.directoryChanged.connect(self.on_path_changed)
+        self.debounce = QTimer(self)
+        self.debounce.setSingleShot(True)
+        self.debounce.timeout.connect(self.flush)
+        self.poll_timer = QTimer(self)
+        self.poll_timer.setInterval(self.POLL_INTERVAL)
+        self.poll_timer.timeout.connect(self.poll)
+        self.update_watches()
+
+    def update_watches(self):
+        """(Re)adds every watch path; files replaced by rename (dpkg's status, snapd's state) drop theirs"""
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        self.polled = set()
+        for backend in Inventory.BACKENDS:
+            for path in Inventory.watch_paths(backend):
+                self.paths[path] = backend
+                if path in watched: continue
+                if not os.path.exists(path) or not self.watcher.addPath(path):
+                    self.polled.add(backend)
+        if self.polled and not self.poll_timer.isActive():
+            self.poll_timer.start()
+        elif not self.polled:
+            self.poll_timer.stop()
+
+    def on_path_changed(self, path):
+        backend = self.paths.get(path)
+        if backend is None: return
+        self.dirty.add(backend)
+        now = time.monotonic()
+        if self.first_event is None:
+            self.first_event = now
+        remaining = self.MAX_DELAY - (now - self.first_event) * 1000
+        self.debounce.start(int(max(0, min(self.DEBOUNCE, remaining))))
+
+    def poll(self):
+        self.dirty |= self.polled
+        self.flush()
+
+    def flush(self):
+        dirty, self.dirty, self.first_event = self.dirty, set(), None
+        changed = []
+        for backend in Inventory.BACKENDS:
+            if backend not in dirty: continue
+            validator = Inventory.validator(backend)
+            if validator != self.validators.get(backend):
+                self.validators[backend] = validator
+                changed.append(backend)
+        self.update_watches()
+        if changed:
+            self.backendsChanged.emit(changed)
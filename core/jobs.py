@@ -0,0 +1,289 @@
+import itertools
+import os
+import time
+from PyQt6.QtCore import QObject, QThread, QCoreApplication, pyqtSignal
+from core.dpkg_status import DpkgStatus
+from core.process import Cancelled, CancelToken, Process
+from core.progress import Progress, AptProgress, FlatpakProgress, SnapProgress
+from core.snap_backend import SnapBackend
+from core.helper_client import HelperClient
+
+class Job(QObject):
+    """One package operation. Submit it to JobQueue.instance(); it runs when its lane has room."""
+    QUEUED, WAITING, RUNNING, DONE, FAILED, CANCELLED = "Queued", "Waiting", "Running", "Done", "Failed", "Cancelled"
+    ACTIVE = (QUEUED, WAITING, RUNNING)
+    LOW, NORMAL, HIGH = 0, 5, 10
+    progress = pyqtSignal(str)
+    # {"percent", "phase", "speed", "eta"}, see core.progress
+    progressInfo = pyqtSignal(dict)
+    stateChanged = pyqtSignal()
+    finished = pyqtSignal(bool, str)
+    _ids = itertools.count(1)
+
+    def __init__(self, title, backend, op=None, args=None, priority=NORMAL):
+        super().__init__()
+        self.id = next(Job._ids)
+        self.title = title
+        self.backend = backend
+        # A privileged helper operation, see core/helper.py
+        self.op = op
+        self.args = args or {}
+        self.priority = priority
+        self.state = Job.QUEUED
+        self.message = ""
+        self.info = {}
+        self.submitted = time.time()
+        self.token = CancelToken()
+        # Inventory keys (see Inventory.key) of the packages this job touched, for a targeted refresh
+        self.changed = set()
+
+    @property
+    def lane(self):
+        """Jobs of one lane run one at a time; APT jobs share the dpkg lock"""
+        return self.backend
+
+    @property
+    def cancellable(self):
+        # dpkg must not be interrupted half way through unpacking or configuring
+        return self.state in (Job.QUEUED, Job.WAITING) or (self.state == Job.RUNNING and self.backend != "APT")
+
+    def set_state(self, state, message=None):
+        self.state = state
+        if message is not None: self.message = message
+        self.stateChanged.emit()
+
+    def report(self, message):
+        self.message = message
+        self.progress.emit(message)
+
+    def report_progress(self, info):
+        self.info = info
+        self.progressInfo.emit(info)
+        self.report(Progress.describe(info))
+
+    def wait_for_dpkg_lock(self):
+        """Blocks, visibly, while another process (apt, unattended-upgrades, ...) holds the dpkg lock"""
+        shown = None
+        while True:
+            holder = DpkgStatus.lock_holder()
+            if holder is None: return
+            self.token.check()
+            # Polled every second; the view only hears about a new holder
+            if holder != shown:
+                shown = holder
+                pid, command = holder
+                self.set_state(Job.WAITING, f"Waiting for {command} (pid {pid}) to release the dpkg lock...")
+            time.sleep(1)
+
+    def execute(self):
+        """Runs in a JobRunner thread; returns (success, message)"""
+        parser = AptProgress() if self.backend == "APT" else FlatpakProgress() if self.backend == "Flatpak" else None
+        output, errors = [], []
+
+        def on_line(line):
+            info = parser.feed(line) if parser else None
+            if info is not None:
+                self.report_progress(info)
+            else:
+                output.append(line)
+                self.report(line)
+
+        def on_error(line):
+            errors.append(line)
+            self.report(line)
+
+        try:
+            code = HelperClient.run(self.op, self.args, on_line, self.token, on_error)
+        finally:
+            if isinstance(parser, AptProgress): self.changed |= parser.packages
+        if code == 0 and self.op.startswith("snap_"):
+            return self.follow_snap_change(output)
+        if code == 0:
+            return True, f"{self.title}: done"
+        # apt marks the actual reason with "E:"; its warnings come first
+        reason = next((e for e in reversed(errors) if e.startswith("E:")), errors[-1] if errors else f"exit code {code}")
+        return False, f"{self.title}: failed ({reason})"
+
+    def follow_snap_change(self, output):
+        """`snap ... --no-wait` only prints the change id; its progress is polled from snapd"""
+        change_id = next((line for line in reversed(output) if line.isdigit()), None)
+        if change_id is None:
+            return True, f"{self.title}: done"
+        parser = SnapProgress()
+        while True:
+            if self.token.cancelled:
+                # Aborting an unprivileged user's change is authorised by snapd itself
+                try:
+                    Process.check_output(["snap", "abort", change_id], timeout=30)
+                except Exception: pass
+                raise Cancelled()
+            change = SnapBackend.get_change(change_id)
+            info = parser.feed(change)
+            if info is not None: self.report_progress(info)
+            if change.get("ready"):
+                if change.get("status") == "Done":
+                    return True, f"{self.title}: done"
+                return False, f"{self.title}: failed ({change.get('err') or change.get('status')})"
+            time.sleep(0.5)
+
+class JobRunner(QThread):
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+
+    def run(self):
+        job = self.job
+        try:
+            if job.lane == "APT":
+                job.wait_for_dpkg_lock()
+            job.set_state(Job.RUNNING, "Starting...")
+            success, message = job.execute()
+            job.set_state(Job.DONE if success else Job.FAILED, message)
+        except Cancelled:
+            success, message = False, f"{job.title}: cancelled"
+            job.set_state(Job.CANCELLED, message)
+        except Exception as e:
+            success, message = False, str(e)
+            job.set_state(Job.FAILED, message)
+        job.finished.emit(success, message)
+
+class JobQueue(QObject):
+    """Central scheduler for every install, removal, upgrade and cleanup. APT jobs are serialised
+    (and wait for foreign dpkg lock holders); Snap, Flatpak and AppImage jobs run alongside them.
+    Within a lane the highest priority runs first, then the oldest."""
+    LANE_LIMITS = {"APT": 1, "Snap": 1, "Flatpak": 1}
+    DEFAULT_LIMIT = 2
+    # Finished jobs kept for the queue view
+    HISTORY = 50
+    jobAdded = pyqtSignal(object)
+    jobChanged = pyqtSignal(object)
+    # A finished job dropped from the history
+    jobRemoved = pyqtSignal(object)
+    activeChanged = pyqtSignal(int)
+    _instance = None
+
+    @staticmethod
+    def instance():
+        if JobQueue._instance is None:
+            app = QCoreApplication.instance()
+            JobQueue._instance = JobQueue(app)
+            app.aboutToQuit.connect(JobQueue._instance.shutdown)
+        return JobQueue._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = []
+        self.runners = {}
+
+    def submit(self, job):
+        self.jobs.append(job)
+        job.stateChanged.connect(lambda j=job: self.jobChanged.emit(j))
+        job.finished.connect(lambda *_, j=job: self.on_finished(j))
+        self.jobAdded.emit(job)
+        self.schedule()
+        return job
+
+    def active(self):
+        return [j for j in self.jobs if j.state in Job.ACTIVE]
+
+    def schedule(self):
+        running = {}
+        for job in self.runners:
+            running[job.lane] = running.get(job.lane, 0) + 1
+        queued = sorted((j for j in self.jobs if j.state == Job.QUEUED and j not in self.runners),
+                        key=lambda j: (-j.priority, j.id))
+        for job in queued:
+            if running.get(job.lane, 0) >= self.LANE_LIMITS.get(job.lane, self.DEFAULT_LIMIT): continue
+            running[job.lane] = running.get(job.lane, 0) + 1
+            runner = JobRunner(job)
+            self.runners[job] = runner
+            runner.start()
+        self.activeChanged.emit(len(self.active()))
+
+    def on_finished(self, job):
+        runner = self.runners.pop(job, None)
+        if runner is not None: runner.wait()
+        finished = [j for j in self.jobs if j.state not in Job.ACTIVE]
+        for old in finished[:-self.HISTORY]:
+            self.jobs.remove(old)
+            self.jobRemoved.emit(old)
+        self.schedule()
+
+    def cancel(self, job):
+        if not job.cancellable: return False
+        job.token.cancel()
+        if job not in self.runners:
+            # Never started: finish it here, no thread to unwind
+            job.set_state(Job.CANCELLED, f"{job.title}: cancelled")
+            job.finished.emit(False, job.message)
+        return True
+
+    def set_priority(self, job, priority):
+        job.priority = priority
+        self.jobChanged.emit(job)
+        self.schedule()
+
+    def clear_finished(self):
+        finished = [j for j in self.jobs if j.state not in Job.ACTIVE]
+        self.jobs = self.active()
+        for job in finished:
+            self.jobRemoved.emit(job)
+        self.activeChanged.emit(len(self.jobs))
+
+    def shutdown(self):
+        for job in list(self.jobs):
+            if job.state == Job.QUEUED: self.cancel(job)
+        for runner in list(self.runners.values()):
+            runner.wait()
+        HelperClient.shutdown()
+
+class InstallJob(Job):
+    """Installs, upgrades (one name or a list, as one transaction) or installs a local .deb"""
+    VERBS = {"install": "Install", "upgrade": "Upgrade", "local": "Install"}
+    def __init__(self, names, backend, action="install", priority=Job.NORMAL):
+        names = [names] if isinstance(names, str) else list(names)
+        target = names[0] if len(names) == 1 else f"{len(names)} {backend} packages"
+        super().__init__(f"{self.VERBS.get(action, action.capitalize())} {target}", backend, priority=priority)
+        self.names = names
+        self.action = action
+        # A .deb is known by its path until dpkg names it
+        if action != "local": self.changed = set(names)
+        if backend == "APT" and action == "local":
+            self.op, self.args = "apt_install_deb", {"path": names[0]}
+        elif backend == "APT":
+            self.op, self.args = "apt_install", {"packages": names, "upgrade": action == "upgrade"}
+        elif backend == "Snap":
+            self.op, self.args = "snap_refresh" if action == "upgrade" else "snap_install", {"packages": names}
+        elif backend == "Flatpak":
+            self.op, self.args = "flatpak_update" if action == "upgrade" else "flatpak_install", {"refs": names}
+
+    def execute(self):
+        if self.op is None:
+            return False, "Unknown package type"
+        return super().execute()
+
+class UninstallJob(Job):
+    def __init__(self, names, backend, priority=Job.NORMAL):
+        names = [names] if isinstance(names, str) else list(names)
+        super().__init__(f"Remove {names[0] if len(names) == 1 else f'{len(names)} {backend} packages'}", backend, priority=priority)
+        self.names = names
+        self.changed = set(names)
+        if backend == "APT":
+            self.op, self.args = "apt_remove", {"packages": names}
+        elif backend == "Snap":
+            self.op, self.args = "snap_remove", {"packages": names}
+        elif backend == "Flatpak":
+            self.op, self.args = "flatpak_uninstall", {"refs": names}
+
+    def execute(self):
+        if self.backend == "AppImage":
+            # AppImage removal is just deleting the file
+            for path in self.names:
+                if not os.path.exists(path):
+                    return False, "AppImage file not found"
+                os.remove(path)
+            return True, f"Removed AppImage {', '.join(self.names)}"
+        if self.op is None:
+            return False, "Unknown package type"
+        success, message = super().execute()
+        return success, f"Uninstalled {', '.join(self.names)}" if success else message
@@ -0,0 +1,80 @@
+import os
+import signal
+import subprocess
+import threading
+
+class Cancelled(Exception):
+    """Raised by a child process call whose CancelToken was cancelled"""
+
+class CancelToken:
+    """Shared between a worker and its owner; cancel() kills every child process still running under it"""
+    def __init__(self):
+        self.cancelled = False
+        self._procs = set()
+        self._callbacks = set()
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        with self._lock:
+            self.cancelled = True
+            procs = list(self._procs)
+            callbacks = list(self._callbacks)
+        for proc in procs:
+            Process.kill(proc)
+        for callback in callbacks:
+            callback()
+
+    def check(self):
+        if self.cancelled: raise Cancelled()
+
+    def _register(self, proc):
+        with self._lock:
+            if self.cancelled: return False
+            self._procs.add(proc)
+            return True
+
+    def _unregister(self, proc):
+        with self._lock:
+            self._procs.discard(proc)
+
+    def on_cancel(self, callback):
+        """Calls callback on cancel() (at once if already cancelled); returns False in that case"""
+        with self._lock:
+            if not self.cancelled:
+                self._callbacks.add(callback)
+                return True
+        callback()
+        return False
+
+    def remove_callback(self, callback):
+        with self._lock:
+            self._callbacks.discard(callback)
+
+class Process:
+    @staticmethod
+    def kill(proc):
+        """Kills the child and anything it spawned (it runs in its own process group)"""
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except OSError: pass
+
+    @staticmethod
+    def check_output(cmd, timeout=None, token=None):
+        """subprocess.check_output(cmd, text=True) that honours a timeout and a CancelToken.
+        Raises subprocess.TimeoutExpired, Cancelled or subprocess.CalledProcessError."""
+        if token is not None: token.check()
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, start_new_session=True)
+        if token is not None and not token._register(proc):
+            Process.kill(proc)
+        try:
+            out, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            Process.kill(proc)
+            proc.communicate()
+            raise
+        finally:
+            if token is not None: token._unregister(proc)
+        if token is not None: token.check()
+        if proc.returncode != 0:
+            raise subprocess.CalledProcessError(proc.returncode, cmd, out)
+        return out
@@ -0,0 +1,181 @@
+import re
+import time
+
+UNITS = {"B": 1, "kB": 1000, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3}
+SIZE = r"([\d.,]+)\s*(B|kB|KB|MB|GB)"
+
+class Progress:
+    """Running state of one operation: overall percent, current phase, transfer speed and ETA.
+    Backends feed it what they know; speed and ETA are derived from how fast those numbers move."""
+    # Seconds between speed samples, and the weight of the newest one
+    SAMPLE = 0.5
+    SMOOTHING = 0.3
+
+    def __init__(self):
+        self.percent = None
+        self.phase = ""
+        self.speed = None
+        self.eta = None
+        self.phase_key = None
+        self.mark = None
+        self.sample = None
+
+    def update(self, percent=None, phase=None, phase_key=None, done=None, speed=None, eta=None):
+        """Returns a snapshot {"percent", "phase", "speed", "eta"} to emit to the UI"""
+        now = time.monotonic()
+        if phase is not None: self.phase = phase
+        if phase_key is not None and phase_key != self.phase_key:
+            # Download and dpkg run at unrelated rates; each phase gets its own estimate
+            self.phase_key = phase_key
+            self.mark = self.sample = None
+            self.speed = None
+        if percent is not None:
+            self.percent = max(0.0, min(100.0, percent))
+            if self.mark is None:
+                self.mark = (now, self.percent)
+        if speed is not None:
+            self.speed = speed
+        elif done is not None:
+            if self.sample is None:
+                self.sample = (now, done)
+            elif now - self.sample[0] >= self.SAMPLE:
+                rate = (done - self.sample[1]) / (now - self.sample[0])
+                self.speed = rate if self.speed is None else self.SMOOTHING * rate + (1 - self.SMOOTHING) * self.speed
+                self.sample = (now, done)
+        if eta is not None:
+            self.eta = eta
+        elif self.mark is not None and self.percent is not None and self.percent > self.mark[1]:
+            elapsed = now - self.mark[0]
+            self.eta = elapsed * (100 - self.percent) / (self.percent - self.mark[1])
+        return self.snapshot()
+
+    def snapshot(self):
+        return {"percent": self.percent, "phase": self.phase, "speed": self.speed, "eta": self.eta}
+
+    @staticmethod
+    def parse_size(number, unit):
+        # apt groups thousands ("1,585 kB"); a lone comma before other than three digits is a decimal comma
+        if "," in number and ("." in number or re.search(r",\d{3}$", number)):
+            number = number.replace(",", "")
+        try:
+            return float(number.replace(",", ".")) * UNITS[unit]
+        except (ValueError, KeyError):
+            return None
+
+    @staticmethod
+    def parse_duration(text):
+        """'1:05' or '1:02:03' -> seconds"""
+        seconds = 0
+        for part in text.split(":"):
+            seconds = seconds * 60 + int(part)
+        return seconds
+
+    @staticmethod
+    def format_bytes(value):
+        for unit in ("B", "kB", "MB"):
+            if value < 1000: return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+            value /= 1000
+        return f"{value:.1f} GB"
+
+    @staticmethod
+    def describe(info):
+        """One status line: 'Unpacking vlc — 45% · 1.2 MB/s · 0:12 left'"""
+        parts = []
+        if info.get("percent") is not None: parts.append(f"{info['percent']:.0f}%")
+        if info.get("speed"): parts.append(f"{Progress.format_bytes(info['speed'])}/s")
+        if info.get("eta") is not None and info.get("percent", 0) < 100:
+            minutes, seconds = divmod(int(info["eta"]), 60)
+            parts.append(f"{minutes}:{seconds:02d} left")
+        return " — ".join(p for p in (info.get("phase", ""), " · ".join(parts)) if p)
+
+class AptProgress:
+    """apt's machine-readable progress (APT::Status-Fd): dlstatus for the download, pmstatus for dpkg.
+    Overall percent is download 0-50 and dpkg 50-100 when anything was downloaded, dpkg 0-100 otherwise."""
+    STATUS = re.compile(r"^(dlstatus|pmstatus|pmerror|pmconffile):(.*?):(\d+(?:\.\d+)?):(.*)$")
+    NEED = re.compile(r"Need to get " + SIZE)
+    ITEM = re.compile(r"\[" + SIZE + r"\]$")
+
+    def __init__(self):
+        self.progress = Progress()
+        self.downloading = False
+        self.total_bytes = None
+        self.item_bytes = 0
+        # Every package dpkg worked on, dependencies included
+        self.packages = set()
+
+    def feed(self, line):
+        """Returns a progress snapshot for status lines, None for ordinary output"""
+        m = self.STATUS.match(line)
+        if not m:
+            # Download size, for bytes per second: the summary line, else the sum of the announced items
+            need = self.NEED.search(line)
+            if need:
+                self.total_bytes = Progress.parse_size(*need.groups())
+            else:
+                item = self.ITEM.search(line)
+                if item and line.startswith("Get:"):
+                    self.item_bytes += Progress.parse_size(*item.groups()) or 0
+            return None
+        kind, item, percent, message = m.groups()
+        percent = float(percent)
+        if kind == "dlstatus":
+            self.downloading = True
+            total = self.total_bytes or self.item_bytes or None
+            done = total * percent / 100 if total else None
+            return self.progress.update(percent / 2, f"Downloading — {message}", "download", done=done)
+        if kind == "pmstatus":
+            self.packages.add(item.split(":")[0])
+            overall = 50 + percent / 2 if self.downloading else percent
+            return self.progress.update(overall, message, "dpkg")
+        return None
+
+class FlatpakProgress:
+    """flatpak's transaction output: 'Installing 2/3… ████ 45%  1.2 MB/s  00:10'"""
+    STEP = re.compile(r"^(Installing|Updating|Uninstalling)\s+(\d+)/(\d+)")
+    PERCENT = re.compile(r"(\d{1,3})%")
+    SPEED = re.compile(SIZE + r"/s")
+    ETA = re.compile(r"(\d+:\d{2}(?::\d{2})?)\s*$")
+
+    def __init__(self):
+        self.progress = Progress()
+        self.step, self.steps, self.verb = 1, 1, ""
+
+    def feed(self, line):
+        step = self.STEP.match(line)
+        if step:
+            self.verb = step.group(1)
+            self.step, self.steps = int(step.group(2)), max(1, int(step.group(3)))
+        percent = self.PERCENT.search(line)
+        if not percent: return None
+        overall = (self.step - 1 + int(percent.group(1)) / 100) / self.steps * 100
+        speed = self.SPEED.search(line)
+        eta = self.ETA.search(line)
+        return self.progress.update(
+            overall, f"{self.verb or 'Working'} {self.step}/{self.steps}", "transaction",
+            speed=Progress.parse_size(*speed.groups()) if speed else None,
+            eta=Progress.parse_duration(eta.group(1)) if eta else None)
+
+class SnapProgress:
+    """Progress of a snapd change, from its task list: finished tasks count whole, the running one
+    by its done/total (bytes while downloading)"""
+    def __init__(self):
+        self.progress = Progress()
+
+    def feed(self, change):
+        tasks = change.get("tasks") or []
+        if not tasks: return None
+        finished, current, done = 0.0, None, None
+        for task in tasks:
+            status = task.get("status")
+            prog = task.get("progress") or {}
+            if status in ("Done", "Undone", "Hold", "Error"):
+                finished += 1
+            elif status == "Doing":
+                total = prog.get("total") or 1
+                finished += min(1.0, prog.get("done", 0) / total)
+                if current is None:
+                    current = task
+                    # Byte counts are only reported for downloads
+                    if total > 1: done = prog.get("done", 0)
+        phase = current.get("summary", "") if current else change.get("summary", "")
+        return self.progress.update(finished / len(tasks) * 100, phase, "download" if done is not None else "change", done=done)
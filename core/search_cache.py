@@ -0,0 +1,95 @@
+import time
+import threading
+from collections import OrderedDict
+from core.cache import DiskCache
+from core.config import config
+
+class SearchCache:
+    """Per-backend Discover result cache with a TTL and LRU eviction, persisted across sessions.
+    Tuned through the `search_cache_ttl` (seconds) and `search_cache_size` (entries) config keys."""
+    CACHE_NAME = "search_cache.json"
+    CACHE_VERSION = 1
+    # Backends whose matching is word-prefix based: a longer query only ever matches a subset
+    # of a shorter one, so an empty complete answer for the shorter query is final
+    PREFIX_BACKENDS = {"Flatpak"}
+    _entries = None
+    _stats = None
+    _dirty = False
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _load():
+        if SearchCache._entries is None:
+            doc = DiskCache.load(SearchCache.CACHE_NAME, SearchCache.CACHE_VERSION) or {}
+            SearchCache._entries = OrderedDict((tuple(k), v) for k, v in doc.get("entries", []))
+            SearchCache._stats = doc.get("stats", {})
+
+    @staticmethod
+    def _save():
+        DiskCache.save(SearchCache.CACHE_NAME, SearchCache.CACHE_VERSION, {
+            "entries": [[list(k), v] for k, v in SearchCache._entries.items()],
+            "stats": SearchCache._stats,
+        })
+
+    @staticmethod
+    def _count(backend, kind):
+        stats = SearchCache._stats.setdefault(backend, {"hits": 0, "misses": 0, "prefix": 0})
+        stats[kind] += 1
+        SearchCache._dirty = True
+
+    @staticmethod
+    def _fresh(entry):
+        return entry is not None and time.time() - entry["time"] < config.get("search_cache_ttl")
+
+    @staticmethod
+    def normalize(query):
+        return " ".join(query.lower().split())
+
+    @staticmethod
+    def get(backend, query):
+        """Cached results for a query, or None on a miss"""
+        query = SearchCache.normalize(query)
+        with SearchCache._lock:
+            SearchCache._load()
+            key = (backend, query)
+            entry = SearchCache._entries.get(key)
+            if SearchCache._fresh(entry):
+                SearchCache._entries.move_to_end(key)
+                SearchCache._count(backend, "hits")
+                return entry["results"]
+            if backend in SearchCache.PREFIX_BACKENDS and " " not in query:
+                for n in range(len(query) - 1, 1, -1):
+                    prefix = SearchCache._entries.get((backend, query[:n]))
+                    if SearchCache._fresh(prefix) and prefix["complete"] and not prefix["results"]:
+                        SearchCache._count(backend, "prefix")
+                        return []
+            SearchCache._count(backend, "misses")
+            return None
+
+    @staticmethod
+    def put(backend, query, results, complete):
+        """Stores an answer; `complete` is False when the backend output was truncated"""
+        query = SearchCache.normalize(query)
+        with SearchCache._lock:
+            SearchCache._load()
+            key = (backend, query)
+            SearchCache._entries[key] = {"time": time.time(), "results": results, "complete": complete}
+            SearchCache._entries.move_to_end(key)
+            while len(SearchCache._entries) > config.get("search_cache_size"):
+                SearchCache._entries.popitem(last=False)
+            SearchCache._dirty = True
+
+    @staticmethod
+    def flush():
+        """Writes entries and counters to disk if anything changed since the last flush"""
+        with SearchCache._lock:
+            if SearchCache._entries is None or not SearchCache._dirty: return
+            SearchCache._save()
+            SearchCache._dirty = False
+
+    @staticmethod
+    def stats():
+        """{backend: {"hits", "misses", "prefix"}} accumulated across sessions"""
+        with SearchCache._lock:
+            SearchCache._load()
+            return {b: dict(s) for b, s in SearchCache._stats.items()}
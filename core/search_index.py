@@ -0,0 +1,230 @@
+import re
+import time
+import itertools
+from bisect import bisect_left
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Match-quality tiers, best first
+SCORE_EXACT = 100
+SCORE_PREFIX = 80
+SCORE_NAME_TOKEN = 60
+SCORE_NAME_SUBSTRING = 40
+SCORE_DESC_TOKEN = 20
+SCORE_DESC_SUBSTRING = 10
+# Typo matches, lowered by 4 (name) or 2 (description) per edit
+SCORE_FUZZY_NAME = 30
+SCORE_FUZZY_DESC = 8
+
+# Words shorter than this only match names: a single letter is in nearly every description
+DESC_MIN_LENGTH = 2
+# Words shorter than this never fall back to typo matching
+FUZZY_MIN_LENGTH = 4
+# Seconds a single query may spend verifying typo candidates
+FUZZY_BUDGET = 0.03
+# Seconds a query may spend collecting substring and prefix matches, by default: a one- or two-letter
+# word can match most of a large index, and the installed-package filter runs on the GUI thread
+SEARCH_BUDGET = 0.01
+
+class SearchIndex:
+    """In-memory index over (name, description) documents.
+    Words are looked up in a sorted vocabulary (prefix queries, via bisect) and in a
+    trigram index over that vocabulary (substring queries), so a query never scans the documents.
+    A word that matches nothing falls back to vocabulary tokens within a small edit distance."""
+
+    def __init__(self):
+        self.names = []
+        self.name_postings = {}
+        self.desc_postings = {}
+        self._vocab = None
+        self._trigrams = None
+        self._rank = None
+
+    @staticmethod
+    def tokenize(text):
+        return TOKEN_RE.findall(text.lower())
+
+    def add(self, name, description=""):
+        doc = len(self.names)
+        self.names.append(name.lower())
+        for token in set(self.tokenize(name)):
+            self.name_postings.setdefault(token, []).append(doc)
+        for token in set(self.tokenize(description or "")):
+            self.desc_postings.setdefault(token, []).append(doc)
+        self._vocab = None
+        return doc
+
+    def __len__(self):
+        return len(self.names)
+
+    def build(self):
+        """Builds the vocabulary structures now instead of on the first query"""
+        self._vocab = sorted(set(self.name_postings) | set(self.desc_postings))
+        # Tie-break order among equal scores: shorter names first, then alphabetical
+        self._rank = [0] * len(self.names)
+        for pos, doc in enumerate(sorted(range(len(self.names)), key=lambda doc: (len(self.names[doc]), self.names[doc]))):
+            self._rank[doc] = pos
+        self._trigrams = {}
+        for tid, token in enumerate(self._vocab):
+            for gram in self.trigrams(token):
+                postings = self._trigrams.setdefault(gram, [])
+                if not postings or postings[-1] != tid:
+                    postings.append(tid)
+
+    @staticmethod
+    def trigrams(token):
+        """Inner trigrams plus the two boundary-padded ones, which give short words usable typo candidates"""
+        grams = [token[i:i + 3] for i in range(len(token) - 2)]
+        if len(token) >= 2:
+            grams.append("$" + token[:2])
+            grams.append(token[-2:] + "$")
+        return grams
+
+    def prefix_tokens(self, word):
+        if self._vocab is None: self.build()
+        vocab = self._vocab
+        i = bisect_left(vocab, word)
+        while i < len(vocab) and vocab[i].startswith(word):
+            yield vocab[i]
+            i += 1
+
+    def substring_tokens(self, word):
+        """Vocabulary tokens containing `word`; shorter words fall back to prefix matching"""
+        if self._vocab is None: self.build()
+        if len(word) < 3:
+            return list(self.prefix_tokens(word))
+        grams = [self._trigrams.get(word[i:i + 3]) for i in range(len(word) - 2)]
+        if not all(grams):
+            return []
+        grams.sort(key=len)
+        candidates = set(grams[0])
+        for postings in grams[1:]:
+            candidates.intersection_update(postings)
+            if not candidates: return []
+        return [self._vocab[tid] for tid in candidates if word in self._vocab[tid]]
+
+    @staticmethod
+    def max_distance(word):
+        return 1 if len(word) <= 5 else 2
+
+    @staticmethod
+    def distance(a, b, limit):
+        """Optimal-string-alignment edit distance (insert, delete, substitute, transpose adjacent),
+        or None as soon as it is known to exceed `limit`"""
+        if abs(len(a) - len(b)) > limit:
+            return None
+        prev2, prev = None, list(range(len(b) + 1))
+        for i in range(1, len(a) + 1):
+            cur = [i] + [0] * len(b)
+            for j in range(1, len(b) + 1):
+                cost = 0 if a[i - 1] == b[j - 1] else 1
+                cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+                if prev2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                    cur[j] = min(cur[j], prev2[j - 2] + 1)
+            if min(cur) > limit:
+                return None
+            prev2, prev = prev, cur
+        return prev[-1] if prev[-1] <= limit else None
+
+    def fuzzy_tokens(self, word, deadline):
+        """[(token, distance)] for vocabulary tokens within max_distance(word) edits.
+        Candidates share enough trigrams with the word to possibly be that close;
+        the most promising are verified first and verification stops at `deadline`."""
+        if self._vocab is None: self.build()
+        if len(word) < FUZZY_MIN_LENGTH:
+            return []
+        limit = self.max_distance(word)
+        grams = set(self.trigrams(word))
+        # A substitution breaks at most three trigrams, a transposition four
+        need = max(len(grams) - 4 * limit, 1)
+        shared = {}
+        for gram in grams:
+            for tid in self._trigrams.get(gram, ()):
+                shared[tid] = shared.get(tid, 0) + 1
+            if time.perf_counter() > deadline: break
+        vocab = self._vocab
+        candidates = [tid for tid, n in shared.items() if n >= need and abs(len(vocab[tid]) - len(word)) <= limit]
+        candidates.sort(key=lambda tid: -shared[tid])
+        tokens = []
+        for tid in candidates:
+            if time.perf_counter() > deadline: break
+            dist = self.distance(word, vocab[tid], limit)
+            if dist is not None:
+                tokens.append((vocab[tid], dist))
+        return tokens
+
+    def _fuzzy_docs(self, word, deadline):
+        name_hits, desc_hits = {}, {}
+        for token, dist in self.fuzzy_tokens(word, deadline):
+            score = SCORE_FUZZY_NAME - 4 * dist
+            for doc in self.name_postings.get(token, ()):
+                if name_hits.get(doc, 0) < score: name_hits[doc] = score
+            score = SCORE_FUZZY_DESC - 2 * dist
+            for doc in self.desc_postings.get(token, ()):
+                if desc_hits.get(doc, 0) < score: desc_hits[doc] = score
+        return name_hits, desc_hits
+
+    def _word_docs(self, word, deadline):
+        """Returns (docs matched through the name, docs matched through the description) with the best tier of each.
+        Tokens starting with the word are collected first, then those only containing it; collection stops at
+        `deadline`, so a short word matching most of the index returns part of its matches instead of blocking."""
+        name_hits, desc_hits = {}, {}
+        # Prefix tokens come from the sorted vocabulary lazily, the word itself first
+        tokens = itertools.chain(self.prefix_tokens(word),
+                                 (t for t in self.substring_tokens(word) if not t.startswith(word)) if len(word) >= 3 else ())
+        for token in tokens:
+            prefix = token.startswith(word)
+            for doc in self.name_postings.get(token, ()):
+                score = SCORE_NAME_TOKEN if prefix else SCORE_NAME_SUBSTRING
+                if name_hits.get(doc, 0) < score: name_hits[doc] = score
+            for doc in self.desc_postings.get(token, ()) if len(word) >= DESC_MIN_LENGTH else ():
+                score = SCORE_DESC_TOKEN if prefix else SCORE_DESC_SUBSTRING
+                if desc_hits.get(doc, 0) < score: desc_hits[doc] = score
+            if deadline is not None and time.perf_counter() > deadline: break
+        return name_hits, desc_hits
+
+    def search(self, query, limit=None, budget=SEARCH_BUDGET):
+        """Returns [(doc, score)] for documents matching every word of `query`, best matches first.
+        Words with no exact or substring match are matched with typos, within FUZZY_BUDGET seconds.
+        Substring and prefix matches are collected within `budget` seconds (None: all of them); past it,
+        the remaining tokens of a word are skipped, so the result holds part of the matches."""
+        query = query.strip().lower()
+        words = self.tokenize(query)
+        if not words:
+            return []
+        if self._vocab is None: self.build()
+        start = time.perf_counter()
+        deadline = start + budget if budget is not None else None
+        scores, named = None, None
+        for word in words:
+            name_hits, desc_hits = self._word_docs(word, deadline)
+            if not name_hits and not desc_hits:
+                name_hits, desc_hits = self._fuzzy_docs(word, start + FUZZY_BUDGET)
+            # A name that starts with or contains the query matched its first word through the name
+            if named is None: named = name_hits
+            hits = dict(desc_hits)
+            hits.update(name_hits)
+            if scores is None:
+                scores = hits
+            else:
+                # Every word must match; a document is only as good as its weakest word
+                scores = {doc: min(score, hits[doc]) for doc, score in scores.items() if doc in hits}
+            if not scores: return []
+        for doc in named:
+            if doc not in scores: continue
+            name = self.names[doc]
+            if name == query:
+                scores[doc] = SCORE_EXACT
+            elif name.startswith(query):
+                scores[doc] = SCORE_PREFIX
+            elif len(words) > 1 and query in name:
+                scores[doc] = max(scores[doc], SCORE_NAME_SUBSTRING)
+        # Scores come in a few tiers: sort each tier by the precomputed rank instead of comparing names
+        tiers = {}
+        for doc, score in scores.items():
+            tiers.setdefault(score, []).append(doc)
+        ranked = []
+        for score in sorted(tiers, reverse=True):
+            ranked.extend(zip(sorted(tiers[score], key=self._rank.__getitem__), itertools.repeat(score)))
+            if limit and len(ranked) >= limit: break
+        return ranked[:limit] if limit else ranked
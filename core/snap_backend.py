@@ -1,8 +1,26 @@
 import subprocess
 import os
-from PyQt6.QtCore import QThread, pyqtSignal
+import json
+import socket
+import http.client
+from core.icon_index import IconIndex
+from core.process import Process
+
+class SnapdConnection(http.client.HTTPConnection):
+    """HTTP over snapd's Unix socket; read-only requests need no privileges"""
+    def __init__(self, path, timeout=5):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
 
 class SnapBackend:
+    STATE_FILE = "/var/lib/snapd/state.json"
+    SOCKET = "/run/snapd.socket"
+
     @staticmethod
     def is_available():
         return os.path.exists("/usr/bin/snap")
@@ -10,76 +28,80 @@ class SnapBackend:
     @staticmethod
     def get_snaps():
         snaps = []
-        try:
-            exclude = {"core", "core18", "core20", "core22", "snapd", "bare", "gtk-common-themes"}
-            res = subprocess.check_output(["snap", "list"], text=True)
-            lines = res.splitlines()[1:]
-            for line in lines:
-                parts = line.split()
-                if len(parts) >= 6:
-                    name, version = parts[0], parts[1]
-                    if name in exclude or name.startswith("gnome-"): continue
-                    snaps.append({
-                        "name": name,
-                        "version": version,
-                        "type": "Snap",
-                        "description": f"Snap from {parts[4]}",
-                        "icon": SnapBackend.find_icon(name),
-                        "install_date": "Installed via Snap"
-                    })
-        except: pass
+        exclude = {"core", "core18", "core20", "core22", "snapd", "bare", "gtk-common-themes"}
+        icons = IconIndex.get()
+        res = subprocess.check_output(["snap", "list"], text=True)
+        lines = res.splitlines()[1:]
+        for line in lines:
+            parts = line.split()
+            if len(parts) >= 6:
+                name, version = parts[0], parts[1]
+                if name in exclude or name.startswith("gnome-"): continue
+                snaps.append({
+                    "name": name,
+                    "version": version,
+                    "type": "Snap",
+                    "description": f"Snap from {parts[4]}",
+                    "icon": SnapBackend.find_icon(name, icons),
+                    "install_date": "Installed via Snap"
+                })
         return snaps
 
     @staticmethod
-    def find_icon(name):
-        # Snaps sometimes have icons in /var/lib/snapd/desktop/icons/
-        icon_path = f"/var/lib/snapd/desktop/icons/{name}_icon.png"
-        if os.path.exists(icon_path):
-            return icon_path
-        # Or look in standard locations if it's a popular app
-        for ext in ["png", "svg"]:
-            path = f"/usr/share/pixmaps/{name}.{ext}"
-            if os.path.exists(path): return path
-        return None
+    def find_icon(name, index=None):
+        # Snap icons live in /var/lib/snapd/desktop/icons, which the shared index covers
+        return IconIndex.find(name, index)
 
     @staticmethod
-    def get_upgradable():
+    def get_upgradable(timeout=None, token=None):
         upgradable = []
-        try:
-            res = subprocess.check_output(["snap", "refresh", "--list"], text=True)
-            lines = res.splitlines()[1:]
-            for line in lines:
-                parts = line.split()
-                if len(parts) >= 4:
-                    upgradable.append({
-                        "name": parts[0],
-                        "version": parts[2], # new version
-                        "type": "Snap",
-                        "description": f"Update available: {parts[1]} -> {parts[2]}"
-                    })
-        except: pass
+        if not SnapBackend.is_available(): return upgradable
+        # Failures (offline, snapd down) propagate: they must not be cached as "no updates"
+        res = Process.check_output(["snap", "refresh", "--list"], timeout, token)
+        lines = res.splitlines()[1:]
+        for line in lines:
+            parts = line.split()
+            if len(parts) >= 4:
+                upgradable.append({
+                    "name": parts[0],
+                    "version": parts[2], # new version
+                    "type": "Snap",
+                    "description": f"Update available: {parts[1]} -> {parts[2]}"
+                })
         return upgradable
 
     @staticmethod
-    def search_snaps(query):
+    def search_snaps(query, timeout=None, token=None):
         results = []
-        if not query or len(query) < 2: return results
-        try:
-            res = subprocess.check_output(["snap", "find", query], text=True)
-            lines = res.splitlines()[1:]
-            for line in lines[:50]:
-                parts = line.split()
-                if len(parts) >= 3:
-                    results.append({
-                        "name": parts[0],
-                        "version": parts[1],
-                        "description": parts[2],
-                        "type": "Snap",
-                        "install_date": f"Available from {parts[2]}"
-                    })
-        except: pass
+        if not query or len(query) < 2 or not SnapBackend.is_available(): return results
+        # Failures propagate: an empty answer is cached, and must mean "no matches"
+        res = Process.check_output(["snap", "find", query], timeout, token)
+        lines = res.splitlines()[1:]
+        for line in lines[:50]:
+            parts = line.split()
+            if len(parts) >= 3:
+                results.append({
+                    "name": parts[0],
+                    "version": parts[1],
+                    "description": parts[2],
+                    "type": "Snap",
+                    "install_date": f"Available from {parts[2]}"
+                })
         return results
 
+    @staticmethod
+    def get_change(change_id, socket_path=None):
+        """The snapd change (status, ready, err and its tasks with progress) as a dict"""
+        conn = SnapdConnection(socket_path or SnapBackend.SOCKET)
+        try:
+            conn.request("GET", f"/v2/changes/{change_id}")
+            body = json.loads(conn.getresponse().read())
+        finally:
+            conn.close()
+        if body.get("type") == "error":
+            raise OSError(body.get("result", {}).get("message", "snapd error"))
+        return body["result"]
+
     @staticmethod
     def get_history():
         history = []
@@ -101,17 +123,3 @@ class SnapBackend:
             history.reverse()
         except: pass
         return history
-
-class SnapWorker(QThread):
-    finished = pyqtSignal(list)
-    error = pyqtSignal(str)
-
-    def run(self):
-        try:
-            if not SnapBackend.is_available():
-                self.finished.emit([])
-                return
-            pkgs = SnapBackend.get_snaps()
-            self.finished.emit(pkgs)
-        except Exception as e:
-            self.error.emit(str(e))
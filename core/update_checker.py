@@ -0,0 +1,52 @@
+import time
+import threading
+from core.cache import DiskCache
+from core.config import config
+from core.apt_backend import AptBackend
+from core.snap_backend import SnapBackend
+from core.flatpak_backend import FlatpakBackend
+
+class UpdateChecker:
+    """Per-backend update checks with deadlines, and the last successful result of each persisted
+    with its timestamp so the badge is right at startup. Stale after `updates_ttl` seconds."""
+    CACHE_NAME = "updates.json"
+    CACHE_VERSION = 1
+    BACKENDS = ("APT", "Snap", "Flatpak")
+    # Seconds before a store query is given up; APT is computed locally and needs none
+    TIMEOUTS = {"Snap": 30, "Flatpak": 60}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def load_cached():
+        """{backend: {"time": epoch, "updates": [...]}} from the last successful checks"""
+        return DiskCache.load(UpdateChecker.CACHE_NAME, UpdateChecker.CACHE_VERSION) or {}
+
+    @staticmethod
+    def is_stale(backend, entry):
+        # APT is answered natively in milliseconds, so it is always recomputed
+        if backend == "APT" or not entry:
+            return True
+        return time.time() - entry.get("time", 0) > config.get("updates_ttl")
+
+    @staticmethod
+    def stale_backends(cached=None):
+        if cached is None:
+            cached = UpdateChecker.load_cached()
+        return [b for b in UpdateChecker.BACKENDS if UpdateChecker.is_stale(b, cached.get(b))]
+
+    @staticmethod
+    def check(backend, token=None):
+        """Raises subprocess.TimeoutExpired past the backend's deadline, Cancelled once `token` is cancelled"""
+        if backend == "APT":
+            return AptBackend.get_upgradable()
+        timeout = UpdateChecker.TIMEOUTS.get(backend)
+        if backend == "Snap":
+            return SnapBackend.get_upgradable(timeout, token)
+        return FlatpakBackend.get_upgradable(timeout, token)
+
+    @staticmethod
+    def save(backend, updates):
+        with UpdateChecker._lock:
+            cached = UpdateChecker.load_cached()
+            cached[backend] = {"time": time.time(), "updates": updates}
+            DiskCache.save(UpdateChecker.CACHE_NAME, UpdateChecker.CACHE_VERSION, cached)
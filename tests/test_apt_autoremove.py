@@ -0,0 +1,51 @@
+import os
+import shutil
+import subprocess
+import pytest
+from core.apt_autoremove import AptAutoremove, FIELDS
+from core.dpkg_status import DpkgStatus, STATUS_FILE
+
+def package(version="1.0", **fields):
+    return dict({"Version": version, "Status": "install ok installed", "Installed-Size": "10"}, **fields)
+
+def test_roots_and_reachability():
+    installed = {
+        "app": package(Depends="liba (>= 1), libb | libc", Recommends="extra"),
+        "liba": package(),
+        "libb": package(),
+        "libc": package(),
+        "extra": package(),
+        "unused": package(Depends="libunused"),
+        "libunused": package(),
+        "base": package(Priority="required"),
+        "held": package(Status="hold ok installed"),
+        "kept": package(),
+    }
+    auto = set(installed) - {"app"}
+    config = [("apt::neverautoremove", "^kept$")]
+    assert set(AptAutoremove.compute(installed, auto, config)) == {"unused", "libunused"}
+    config.append(("apt::autoremove::recommendsimportant", "false"))
+    assert set(AptAutoremove.compute(installed, auto, config)) == {"unused", "libunused", "extra"}
+
+def test_versioned_provides():
+    installed = {
+        "app": package(Depends="mail-transport-agent, libfoo (>= 2)"),
+        "postfix": package(Provides="mail-transport-agent"),
+        "libfoo-compat": package(Provides="libfoo (= 2.1)"),
+        "libfoo-old": package(Provides="libfoo"),
+    }
+    orphans = AptAutoremove.compute(installed, set(installed) - {"app"}, [])
+    assert set(orphans) == {"libfoo-old"}
+
+@pytest.mark.skipif(shutil.which("apt-get") is None or not os.path.exists(STATUS_FILE), reason="needs apt and dpkg")
+def test_matches_apt_get_autoremove(tmp_path):
+    # Every installed package marked auto: the widest autoremove apt can be asked to simulate
+    installed = DpkgStatus.read_installed(FIELDS + ("Architecture",))
+    states = tmp_path / "extended_states"
+    states.write_text("".join(f"Package: {name}\nArchitecture: {fields.get('Architecture', 'all')}\nAuto-Installed: 1\n\n"
+                              for name, fields in installed.items()))
+    out = subprocess.run(["apt-get", "-s", "-o", f"Dir::State::extended_states={states}", "autoremove"],
+                         capture_output=True, text=True, env=dict(os.environ, LC_ALL="C")).stdout
+    expected = {line.split()[1].split(":")[0] for line in out.splitlines() if line.startswith("Remv ")}
+    orphans = AptAutoremove.compute(installed, set(installed), AptAutoremove.read_config(), os.uname().release)
+    assert set(orphans) == expected
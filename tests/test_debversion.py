@@ -0,0 +1,35 @@
+import itertools
+import shutil
+import subprocess
+import pytest
+from core.debversion import DebVersion
+
+VERSIONS = [
+    "0", "1", "1.0", "1.0-1", "1.0-1ubuntu1", "1.0~rc1", "1.0~rc1-1", "1.0+dfsg-1", "1.0.1",
+    "1:0.9", "1:1.0", "2:0.1", "1:2:3-1", "1:2:3-2", "1:2:10-1", "0:1.0", "1.0a", "1.0-a",
+    "2.30-0ubuntu2~22.04", "2.30-0ubuntu2", "10.2", "9.12", "1.0~~", "1.0~", "1:1.2:3~4-5-6",
+]
+
+def test_parse_splits_epoch_at_the_first_colon():
+    assert DebVersion.parse("1:2:3-1") == (1, "2:3", "1")
+    assert DebVersion.parse("1:1.2:3~4-5-6") == (1, "1.2:3~4-5", "6")
+    assert DebVersion.parse("1.0") == (0, "1.0", "0")
+
+def test_colon_in_upstream():
+    assert DebVersion.compare("1:2:3-1", "1:0.9") > 0
+    assert DebVersion.compare("1:2:10-1", "1:2:3-1") > 0
+
+@pytest.mark.skipif(shutil.which("dpkg") is None, reason="needs dpkg")
+def test_matches_dpkg_compare_versions():
+    mismatches = []
+    for a, b in itertools.combinations(VERSIONS, 2):
+        if subprocess.run(["dpkg", "--compare-versions", a, "lt", b]).returncode == 0:
+            expected = -1
+        elif subprocess.run(["dpkg", "--compare-versions", a, "eq", b]).returncode == 0:
+            expected = 0
+        else:
+            expected = 1
+        got = DebVersion.compare(a, b)
+        if (got > 0) - (got < 0) != expected:
+            mismatches.append((a, b, expected, got))
+    assert mismatches == []
@@ -0,0 +1,161 @@
+import json
+import os
+import secrets
+import socket
+import stat
+import threading
+import time
+import pytest
+from core import helper
+from core.config import config
+from core.helper import Helper, HelperOps
+from core.helper_client import HelperClient
+
+FAKE_APT = """#!/bin/sh
+for last; do :; done
+case "$last" in
+    fail) echo "E: Unable to locate package fail" >&2; exit 100;;
+    slow) echo started; exec sleep 30;;
+esac
+echo "pmstatus:$last:50:Installing $last"
+echo "done"
+"""
+
+@pytest.mark.parametrize("op, args", [
+    ("rm", {}),
+    ("apt_install", {"packages": []}),
+    ("apt_install", {"packages": "vim"}),
+    ("apt_install", {"packages": ["--purge"]}),
+    ("apt_remove", {"packages": ["-y"]}),
+    ("apt_install", {"packages": ["vim;reboot"]}),
+    ("snap_install", {"packages": ["--dangerous"]}),
+    ("snap_remove", {"packages": ["Firefox"]}),
+    ("flatpak_install", {"refs": ["--user.org"]}),
+    ("flatpak_install", {"refs": ["firefox"]}),
+    ("flatpak_install", {"refs": ["org.mozilla.firefox/../../x"]}),
+    ("flatpak_install", {"refs": ["org.mozilla.firefox/x86_64/stable/a/b"]}),
+    ("flatpak_uninstall", {"refs": ["org.gnome.Maps -y"]}),
+    ("ppa_add", {"source": "--remove"}),
+    ("ppa_add", {"source": "ppa:x/y\nppa:z/w"}),
+    ("source_toggle", {"file": "../../etc/shadow.list"}),
+    ("source_toggle", {"file": "/etc/apt/sources.list"}),
+    ("source_toggle", {"file": "sub/dir.list"}),
+    ("source_toggle", {"file": "notes.txt"}),
+    ("apt_install_deb", {"path": "relative.deb"}),
+    ("apt_install_deb", {"path": "/etc/passwd"}),
+    ("apt_install_deb", {"path": "/nonexistent/package.deb"}),
+])
+def test_build_rejects(op, args):
+    with pytest.raises(ValueError):
+        HelperOps.build(op, args)
+
+def test_build_rejects_directories_named_like_a_deb(tmp_path):
+    (tmp_path / "fake.deb").mkdir()
+    with pytest.raises(ValueError):
+        HelperOps.build("apt_install_deb", {"path": str(tmp_path / "fake.deb")})
+
+def test_build_accepts():
+    assert HelperOps.build("apt_remove", {"packages": ["vim", "libc6:i386"]})[-4:] == ["--purge", "-y", "vim", "libc6:i386"]
+    assert HelperOps.build("flatpak_install", {"refs": ["org.gnome.Maps//stable"]})[-2:] == ["--", "org.gnome.Maps//stable"]
+    assert HelperOps.build("snap_refresh", {"packages": ["core22"]}) == ["snap", "refresh", "--no-wait", "--", "core22"]
+    argv = HelperOps.build("source_toggle", {"file": "foo.list.disabled", "enable": True})
+    assert argv[-2:] == [os.path.join(helper.SOURCES_DIR, "foo.list.disabled"), os.path.join(helper.SOURCES_DIR, "foo.list")]
+
+@pytest.fixture
+def serve(tmp_path, monkeypatch):
+    """Starts an unprivileged helper in a thread, apt-get replaced by a script; returns its address"""
+    fake = tmp_path / "apt-get"
+    fake.write_text(FAKE_APT)
+    fake.chmod(fake.stat().st_mode | stat.S_IXUSR)
+    monkeypatch.setattr(helper, "SAFE_PATH", f"{tmp_path}:{helper.SAFE_PATH}")
+    monkeypatch.setenv("PATH", f"{tmp_path}:{os.environ.get('PATH', '')}")
+    helpers = []
+
+    def start(uid=None, dry_run=False):
+        address = "\0linuxpkgmanager-test-" + secrets.token_hex(8)
+        h = Helper(address, os.getuid() if uid is None else uid, os.getppid(), dry_run)
+        thread = threading.Thread(target=h.serve, daemon=True)
+        thread.start()
+        helpers.append((h, thread))
+        for _ in range(250):
+            try:
+                connect(address).close()
+                break
+            except OSError:
+                time.sleep(0.02)
+        return address
+
+    yield start
+    for h, thread in helpers:
+        h.stopping = True
+        thread.join(5)
+
+def connect(address):
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(10)
+    sock.connect(address)
+    return sock
+
+def request(address, op, args=None, after=None):
+    """Sends one request and returns the messages until the connection closes"""
+    sock = connect(address)
+    try:
+        sock.sendall(json.dumps({"op": op, "args": args or {}}).encode() + b"\n")
+        messages = []
+        for line in sock.makefile("rb"):
+            messages.append(json.loads(line))
+            if after: after(sock, messages[-1])
+        return messages
+    finally:
+        sock.close()
+
+def test_ping(serve):
+    assert request(serve(), "ping") == [{"event": "exit", "code": 0}]
+
+def test_output_is_streamed(serve):
+    messages = request(serve(), "apt_install", {"packages": ["vim"]})
+    assert messages == [{"event": "stdout", "text": "pmstatus:vim:50:Installing vim"},
+                        {"event": "stdout", "text": "done"},
+                        {"event": "exit", "code": 0}]
+
+def test_exit_code_and_stderr(serve):
+    messages = request(serve(), "apt_install", {"packages": ["fail"]})
+    assert {"event": "stderr", "text": "E: Unable to locate package fail"} in messages
+    assert messages[-1] == {"event": "exit", "code": 100}
+
+def test_refused_request(serve):
+    messages = request(serve(), "apt_install", {"packages": ["--allow-unauthenticated"]})
+    assert [m["event"] for m in messages] == ["error"]
+
+def test_cancel(serve):
+    def cancel(sock, message):
+        if message.get("text") == "started":
+            sock.sendall(json.dumps({"op": "cancel"}).encode() + b"\n")
+
+    started = time.monotonic()
+    messages = request(serve(), "apt_install", {"packages": ["slow"]}, after=cancel)
+    assert messages[-1]["event"] == "exit" and messages[-1]["code"] != 0
+    assert time.monotonic() - started < 10
+
+def test_dry_run(serve):
+    messages = request(serve(dry_run=True), "apt_remove", {"packages": ["vim"]})
+    assert messages[0]["text"].startswith("would run: apt-get")
+    assert messages[-1] == {"event": "exit", "code": 0}
+
+def test_foreign_peer_is_refused(serve):
+    try:
+        messages = request(serve(uid=os.getuid() + 1), "ping")
+    except ConnectionError:
+        # Closed before the request was written (BrokenPipeError) or read (ConnectionResetError)
+        messages = []
+    assert messages == []
+
+def test_client_passes_helper_args(monkeypatch):
+    monkeypatch.setitem(config.config, "helper_launcher", "")
+    monkeypatch.setitem(config.config, "helper_args", "--dry-run")
+    lines = []
+    try:
+        assert HelperClient.run("apt_remove", {"packages": ["vim"]}, lines.append) == 0
+    finally:
+        HelperClient.shutdown()
+    assert lines and lines[0].startswith("would run: apt-get")
@@ -1,9 +1,18 @@
+import os
+import subprocess
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QFrame, QScrollArea, QLineEdit, QProgressBar, QSpacerItem, QSizePolicy
 )
 from PyQt6.QtCore import Qt, QTimer, QThread, pyqtSignal
-from core.apt_backend import AptBackend, InstallWorker
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from core.apt_backend import AptBackend
+from core.apt_index import AptIndex
+from core.jobs import Job, InstallJob, JobQueue
+from core.process import Cancelled, CancelToken
+from core.search_cache import SearchCache
+from core.appstream_index import AppStreamIndex
+from ui.icon_cache import IconCache, IconLoader
 from core.snap_backend import SnapBackend
 from core.flatpak_backend import FlatpakBackend
 
@@ -12,7 +21,17 @@ class DiscoverView(QWidget):
         super().__init__(parent)
         self.setObjectName("discoverView")
         self.results = []
+        self.query = ""
+        self.apt_total = 0
+        self.apt_offset = 0
+        self.more_btn = None
+        self.active = set()
+        self.workers = set()
+        self.pending = []
+        self.status_note = ""
+        self.icon_labels = {}
         self.init_ui()
+        IconLoader.instance().iconReady.connect(self.on_icon_ready)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -72,16 +91,80 @@ class DiscoverView(QWidget):
         query = self.search_bar.text()
         self.status_label.setText(f"Searching for '{query}'...")
         self.clear_list()
-        
-        self.worker = SearchWorker(query)
-        self.worker.finished.connect(self.on_results_loaded)
-        self.worker.start()
-
-    def on_results_loaded(self, results):
-        self.results = results
-        self.status_label.setText(f"Found {len(self.results)} results.")
-        for res in self.results:
+        self.query = query
+        self.results = []
+        self.apt_total = 0
+        self.apt_offset = 0
+        # A superseded search is cancelled (its child processes are killed) but kept alive until its thread exits
+        for worker in self.active:
+            worker.cancel()
+        self.active = set()
+        self.pending = []
+        self.start_worker(SearchWorker(query))
+
+    def load_more(self):
+        self.more_btn.setEnabled(False)
+        self.more_btn.setText("Loading...")
+        self.start_worker(SearchWorker(self.query, self.apt_offset))
+
+    def start_worker(self, worker):
+        self.active.add(worker)
+        self.workers.add(worker)
+        self.pending.extend(worker.backends)
+        worker.backendLoaded.connect(self.on_results_loaded)
+        worker.backendFailed.connect(self.on_backend_failed)
+        worker.finished.connect(lambda w=worker: self.workers.discard(w))
+        worker.start()
+
+    def on_results_loaded(self, backend, results, apt_total, consumed):
+        if self.sender() not in self.active: return
+        if backend in self.pending: self.pending.remove(backend)
+        if backend == "APT":
+            self.apt_total = apt_total
+            self.apt_offset += consumed
+        self.results.extend(results)
+        for res in results:
             self.add_result_card(res)
+        self.update_status()
+        self.place_more_button()
+
+    def on_backend_failed(self, backend, error):
+        if self.sender() not in self.active: return
+        if backend in self.pending: self.pending.remove(backend)
+        self.update_status(f"{backend} search failed: {error}")
+        self.place_more_button()
+
+    def update_status(self, note=""):
+        # Package rows are counted through the index total, apps and other backends as shown
+        total = sum(1 for res in self.results if res["type"] != "APT" or res.get("app")) + self.apt_total
+        text = f"Found {total} results."
+        if self.pending:
+            text += f" Still searching {', '.join(self.pending)}..."
+        if note:
+            self.status_note = note
+        elif not self.pending and self.status_note:
+            note = self.status_note
+        if note:
+            text += f" ({note})"
+        self.status_label.setText(text)
+        tooltip = "Search cache: " + ", ".join(
+            f"{b} {s['hits'] + s['prefix']} hits / {s['misses']} misses" for b, s in SearchCache.stats().items())
+        skipped = AptIndex.skipped()
+        if skipped:
+            tooltip += "\nAPT lists that could not be read: " + ", ".join(os.path.basename(p) for p in skipped)
+        self.status_label.setToolTip(tooltip)
+
+    def place_more_button(self):
+        """Keeps the "Show more" button below every result streamed in so far"""
+        if self.more_btn is not None:
+            self.list_layout.removeWidget(self.more_btn)
+            self.more_btn.deleteLater()
+            self.more_btn = None
+        if self.apt_offset < self.apt_total:
+            self.more_btn = QPushButton(f"Show more APT results ({self.apt_total - self.apt_offset} left)")
+            self.more_btn.setObjectName("actionBtn")
+            self.more_btn.clicked.connect(self.load_more)
+            self.list_layout.addWidget(self.more_btn)
 
     def add_result_card(self, res):
         card = QFrame()
@@ -89,6 +172,12 @@ class DiscoverView(QWidget):
         card.setStyleSheet("background-color: #2d2d2d; border-radius: 10px; border: 1px solid #3d3d3d;")
         card.setFixedHeight(100)
         c_layout = QHBoxLayout(card)
+
+        icon = QLabel()
+        icon.setFixedSize(48, 48)
+        icon.setStyleSheet("border: none; background: transparent;")
+        self.set_icon(icon, res)
+        c_layout.addWidget(icon)
         
         v_info = QVBoxLayout()
         name_row = QHBoxLayout()
@@ -99,6 +188,14 @@ class DiscoverView(QWidget):
         badge.setStyleSheet(f"background-color: {badge_color}; color: white; border-radius: 4px; padding: 2px 8px; font-size: 10px; font-weight: bold;")
         name_row.addWidget(name)
         name_row.addWidget(badge)
+        if res.get("version") and res["version"] != "Latest":
+            version = QLabel(res["version"])
+            version.setStyleSheet("font-size: 12px; color: #a0a0a0;")
+            name_row.addWidget(version)
+        if res.get("categories"):
+            categories = QLabel(" · ".join(res["categories"][:3]))
+            categories.setStyleSheet("font-size: 12px; color: #a0a0a0;")
+            name_row.addWidget(categories)
         name_row.addStretch()
         v_info.addLayout(name_row)
         
@@ -120,7 +217,22 @@ class DiscoverView(QWidget):
         
         self.list_layout.addWidget(card)
 
+    def set_icon(self, label, res):
+        """Letter avatar first; catalog icons are decoded in the background and swapped in"""
+        loader = IconLoader.instance()
+        label.setPixmap(loader.request(res, 48))
+        key = IconCache.key(res, 48, "dark")
+        if loader.is_pending(key):
+            self.icon_labels.setdefault(key, []).append(label)
+
+    def on_icon_ready(self, key):
+        for label in self.icon_labels.pop(key, []):
+            label.setPixmap(IconCache.cached(key))
+
     def clear_list(self):
+        self.icon_labels = {}
+        self.more_btn = None
+        self.status_note = ""
         while self.list_layout.count():
             item = self.list_layout.takeAt(0)
             if item.widget():
@@ -131,10 +243,19 @@ class DiscoverView(QWidget):
         self.progress_label.setText(f"Installing {res['name']}...")
         self.progress_bar.setRange(0, 0)
         
-        self.worker_inst = InstallWorker(res["name"], res["type"], action="install")
+        # Apps install their package (APT) or application id (Flatpak), not their display name
+        target = res.get("package") or res["name"]
+        self.worker_inst = InstallJob(target, res["type"], action="install", priority=Job.HIGH)
         self.worker_inst.progress.connect(lambda m: self.progress_label.setText(m))
+        self.worker_inst.stateChanged.connect(lambda j=self.worker_inst: self.progress_label.setText(j.message))
+        self.worker_inst.progressInfo.connect(self.on_install_progress)
         self.worker_inst.finished.connect(self.on_install_finished)
-        self.worker_inst.start()
+        JobQueue.instance().submit(self.worker_inst)
+
+    def on_install_progress(self, info):
+        if info.get("percent") is not None:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(int(info["percent"]))
 
     def on_install_finished(self, success, message):
         self.progress_bar.setRange(0, 1)
@@ -142,13 +263,71 @@ class DiscoverView(QWidget):
         self.progress_label.setText(message)
 
 class SearchWorker(QThread):
-    finished = pyqtSignal(list)
-    def __init__(self, query):
+    """Queries every backend concurrently and streams each one's results as soon as it answers"""
+    TIMEOUTS = {"Snap": 15, "Flatpak": 15}
+    # search_snaps and search_flatpaks keep at most this many rows
+    RESULT_LIMIT = 50
+    # Catalog applications shown above the APT package matches on the first page
+    APP_LIMIT = 10
+    backendLoaded = pyqtSignal(str, list, int, int)
+    backendFailed = pyqtSignal(str, str)
+    def __init__(self, query, apt_offset=0):
         super().__init__()
         self.query = query
+        self.apt_offset = apt_offset
+        self.token = CancelToken()
+        # Further pages only page through the APT index
+        self.backends = ["APT", "Snap", "Flatpak"] if apt_offset == 0 else ["APT"]
+
+    def cancel(self):
+        self.token.cancel()
+
+    def search(self, backend):
+        # APT answers from the local repository index, only the network-bound backends are cached
+        if backend == "APT":
+            return self.search_apt()
+        if backend == "Flatpak" and AppStreamIndex.has_catalog("Flatpak"):
+            results = AppStreamIndex.search(self.query, "Flatpak", self.RESULT_LIMIT)
+            return results, 0, len(results)
+        results = SearchCache.get(backend, self.query)
+        if results is not None:
+            return results, 0, len(results)
+        if backend == "Snap":
+            results = SnapBackend.search_snaps(self.query, self.TIMEOUTS["Snap"], self.token)
+        else:
+            results = FlatpakBackend.search_flatpaks(self.query, self.TIMEOUTS["Flatpak"], self.token)
+        # Only reached on success: a failed search raises and is never cached
+        SearchCache.put(backend, self.query, results, complete=len(results) < self.RESULT_LIMIT)
+        return results, 0, len(results)
+
+    def search_apt(self):
+        """(apps + package page, package total, package rows consumed from the index)"""
+        apps = AppStreamIndex.search(self.query, "APT", self.APP_LIMIT)
+        packages, total = AptBackend.search_packages(self.query, self.apt_offset)
+        shown = {app["package"] for app in apps}
+        results = [p for p in packages if p["name"] not in shown]
+        if self.apt_offset == 0:
+            results = apps + results
+        return results, total, len(packages)
+
     def run(self):
-        results = []
-        results.extend(AptBackend.search_packages(self.query))
-        results.extend(SnapBackend.search_snaps(self.query))
-        results.extend(FlatpakBackend.search_flatpaks(self.query))
-        self.finished.emit(results)
+        with ThreadPoolExecutor(max_workers=len(self.backends)) as pool:
+            futures = {pool.submit(self.search, b): b for b in self.backends}
+            for future in as_completed(futures):
+                if self.token.cancelled: break
+                backend = futures[future]
+                try:
+                    results, total, consumed = future.result()
+                except Cancelled:
+                    break
+                except subprocess.TimeoutExpired:
+                    self.backendFailed.emit(backend, "timed out")
+                    continue
+                except subprocess.CalledProcessError as e:
+                    self.backendFailed.emit(backend, f"{e.cmd[0]} exited with status {e.returncode}")
+                    continue
+                except Exception as e:
+                    self.backendFailed.emit(backend, str(e))
+                    continue
+                self.backendLoaded.emit(backend, results, total, consumed)
+        SearchCache.flush()
@@ -0,0 +1,149 @@
+from PyQt6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+    QFrame, QScrollArea, QProgressBar
+)
+from PyQt6.QtCore import Qt, pyqtSignal
+from core.jobs import Job, JobQueue
+
+STATE_COLORS = {
+    Job.QUEUED: "#a0a0a0", Job.WAITING: "#f5c211", Job.RUNNING: "#3584e4",
+    Job.DONE: "#33d17a", Job.FAILED: "#ef4444", Job.CANCELLED: "#a0a0a0",
+}
+
+class JobsView(QWidget):
+    """The job queue: what runs, what waits (and on what), with priority and cancel controls"""
+    activeCount = pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setObjectName("jobsView")
+        self.cards = {}
+        self.queue = JobQueue.instance()
+        self.init_ui()
+        self.queue.jobAdded.connect(self.on_job_added)
+        self.queue.jobChanged.connect(self.on_job_changed)
+        self.queue.jobRemoved.connect(self.on_job_removed)
+        self.queue.activeChanged.connect(self.on_active_changed)
+        for job in self.queue.jobs:
+            self.on_job_added(job)
+
+    def init_ui(self):
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(40, 20, 40, 40)
+        layout.setSpacing(24)
+
+        h_title = QHBoxLayout()
+        title = QLabel("Jobs")
+        title.setObjectName("appTitle")
+        h_title.addWidget(title)
+        h_title.addStretch()
+
+        self.btn_clear = QPushButton("Clear Finished")
+        self.btn_clear.setObjectName("sidebarBtn")
+        self.btn_clear.setFixedWidth(140)
+        self.btn_clear.clicked.connect(self.clear_finished)
+        h_title.addWidget(self.btn_clear)
+        layout.addLayout(h_title)
+
+        self.status_label = QLabel("No jobs yet. Installs, removals and updates are queued here.")
+        self.status_label.setObjectName("pkgMeta")
+        layout.addWidget(self.status_label)
+
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        self.scroll.setObjectName("mainScroll")
+        self.scroll_content = QWidget()
+        self.scroll_content.setObjectName("scrollContainer")
+        self.list_layout = QVBoxLayout(self.scroll_content)
+        self.list_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.scroll.setWidget(self.scroll_content)
+        layout.addWidget(self.scroll)
+
+    def on_job_added(self, job):
+        card = QFrame()
+        card.setObjectName("packageCard")
+        card.setStyleSheet("background-color: #2d2d2d; border-radius: 10px; border: 1px solid #3d3d3d;")
+        card.setFixedHeight(96)
+        c_layout = QHBoxLayout(card)
+
+        v_info = QVBoxLayout()
+        name_row = QHBoxLayout()
+        name = QLabel(job.title)
+        name.setStyleSheet("font-size: 15px; font-weight: bold;")
+        badge_color = "#3584e4" if job.backend == "APT" else "#ec4899" if job.backend == "Snap" else "#33d17a"
+        badge = QLabel(job.backend.upper())
+        badge.setStyleSheet(f"background-color: {badge_color}; color: white; border-radius: 4px; padding: 2px 8px; font-size: 10px; font-weight: bold;")
+        state = QLabel()
+        name_row.addWidget(name)
+        name_row.addWidget(badge)
+        name_row.addWidget(state)
+        name_row.addStretch()
+        v_info.addLayout(name_row)
+        message = QLabel()
+        message.setStyleSheet("font-size: 12px; color: #a0a0a0;")
+        v_info.addWidget(message)
+        bar = QProgressBar()
+        bar.setFixedHeight(6)
+        bar.setTextVisible(False)
+        v_info.addWidget(bar)
+        c_layout.addLayout(v_info, 1)
+
+        btn_first = QPushButton("Run Next")
+        btn_first.setObjectName("sidebarBtn")
+        btn_first.setFixedWidth(100)
+        btn_first.clicked.connect(lambda: self.queue.set_priority(job, Job.HIGH + 1))
+        c_layout.addWidget(btn_first)
+
+        btn_cancel = QPushButton("Cancel")
+        btn_cancel.setObjectName("dangerBtn")
+        btn_cancel.setFixedWidth(100)
+        btn_cancel.clicked.connect(lambda: self.queue.cancel(job))
+        c_layout.addWidget(btn_cancel)
+
+        self.cards[job] = (card, state, message, btn_first, btn_cancel, bar)
+        job.progress.connect(lambda text, j=job: self.on_job_progress(j, text))
+        job.progressInfo.connect(lambda info, j=job: self.on_job_progress_info(j, info))
+        self.list_layout.addWidget(card)
+        self.on_job_changed(job)
+
+    def on_job_progress(self, job, text):
+        if job in self.cards:
+            self.cards[job][2].setText(text[:120])
+
+    def on_job_progress_info(self, job, info):
+        if job in self.cards and info.get("percent") is not None:
+            bar = self.cards[job][5]
+            bar.setRange(0, 100)
+            bar.setValue(int(info["percent"]))
+
+    def on_job_changed(self, job):
+        if job not in self.cards: return
+        card, state, message, btn_first, btn_cancel, bar = self.cards[job]
+        state.setText(job.state)
+        state.setStyleSheet(f"font-size: 12px; font-weight: bold; color: {STATE_COLORS[job.state]}; border: none;")
+        message.setText(job.message[:120])
+        btn_first.setVisible(job.state == Job.QUEUED)
+        btn_cancel.setVisible(job.cancellable)
+        bar.setVisible(job.state in (Job.WAITING, Job.RUNNING))
+        if job.state == Job.RUNNING and not job.info:
+            # Indeterminate until the backend reports a percentage
+            bar.setRange(0, 0)
+
+    def on_job_removed(self, job):
+        # The queue keeps a bounded history; its cards go with it
+        if job not in self.cards: return
+        card = self.cards.pop(job)[0]
+        self.list_layout.removeWidget(card)
+        card.deleteLater()
+
+    def on_active_changed(self, count):
+        if count:
+            running = sum(1 for job in self.queue.jobs if job.state == Job.RUNNING)
+            self.status_label.setText(f"{count} active jobs ({running} running).")
+        elif self.cards:
+            self.status_label.setText("All jobs finished.")
+        self.activeCount.emit(count)
+
+    def clear_finished(self):
+        # The cards are dropped through jobRemoved
+        self.queue.clear_finished()
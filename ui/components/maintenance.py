@@ -4,9 +4,11 @@ from PyQt6.QtWidgets import (
 )
 from PyQt6.QtCore import Qt, pyqtSignal
 from core.maintenance_worker import MaintenanceWorker
+from core.jobs import Job, JobQueue
+from core.progress import Progress
 
 class OrphanDetailsDialog(QDialog):
-    def __init__(self, orphans, size, parent=None):
+    def __init__(self, orphans, size, sizes=None, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Orphaned Packages Details")
         self.setFixedSize(500, 400)
@@ -22,7 +24,8 @@ class OrphanDetailsDialog(QDialog):
         
         self.text_area = QTextEdit()
         self.text_area.setReadOnly(True)
-        self.text_area.setText("\n".join(orphans))
+        sizes = sizes or {}
+        self.text_area.setText("\n".join(f"{name}  —  {Progress.format_bytes(sizes[name] * 1024)}" if name in sizes else name for name in orphans))
         self.text_area.setStyleSheet("background-color: #2d2d2d; border: 1px solid #3d3d3d; border-radius: 6px; padding: 10px; color: #cccccc;")
         layout.addWidget(self.text_area)
         
@@ -41,7 +44,8 @@ class MaintenanceView(QWidget):
         super().__init__(parent)
         self.setObjectName("maintenanceView")
         self.orphans = []
-        self.orphan_size = "0 KB"
+        self.orphan_size = Progress.format_bytes(0)
+        self.orphan_sizes = {}
         self.init_ui()
         self.refresh_cache_info()
 
@@ -142,7 +146,7 @@ class MaintenanceView(QWidget):
     def on_orphans_scanned(self, type, success, message, data):
         self.btn_scan_orphans.setEnabled(True)
         if success:
-            self.orphans, self.orphan_size = data
+            self.orphans, self.orphan_size, self.orphan_sizes = data
             if self.orphans:
                 self.orphan_status.setText(f"Found {len(self.orphans)} orphans ({self.orphan_size} can be freed).")
                 self.btn_scan_orphans.setText("Clean Orphans")
@@ -156,23 +160,25 @@ class MaintenanceView(QWidget):
 
     def show_orphan_details(self):
         if self.orphans:
-            diag = OrphanDetailsDialog(self.orphans, self.orphan_size, self)
+            diag = OrphanDetailsDialog(self.orphans, self.orphan_size, self.orphan_sizes, self)
             diag.exec()
 
     def clean_orphans(self):
         self.btn_scan_orphans.setEnabled(False)
         self.btn_details.setEnabled(False)
         self.orphan_status.setText("Cleaning system (requires password)...")
-        self.worker = MaintenanceWorker("clean_orphans")
-        self.worker.finished.connect(self.on_cleaned)
-        self.worker.start()
+        self.job = Job("Remove orphaned packages", "APT", "apt_autoremove", priority=Job.LOW)
+        self.job.stateChanged.connect(lambda j=self.job: self.orphan_status.setText(j.message))
+        self.job.finished.connect(lambda s, m: self.on_cleaned("clean_orphans", s, m, None))
+        JobQueue.instance().submit(self.job)
 
     def clean_cache(self):
         self.btn_clean_cache.setEnabled(False)
         self.cache_status.setText("Cleaning cache (requires password)...")
-        self.worker = MaintenanceWorker("clean_cache")
-        self.worker.finished.connect(self.on_cleaned)
-        self.worker.start()
+        self.job = Job("Clean APT cache", "APT", "apt_clean", priority=Job.LOW)
+        self.job.stateChanged.connect(lambda j=self.job: self.cache_status.setText(j.message))
+        self.job.finished.connect(lambda s, m: self.on_cleaned("clean_cache", s, m, None))
+        JobQueue.instance().submit(self.job)
 
     def on_cleaned(self, type, success, message, data):
         self.btn_scan_orphans.setEnabled(True)
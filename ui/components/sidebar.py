@@ -93,6 +93,10 @@ class Sidebar(QFrame):
         self.btn_updates = SidebarButton("Updates")
         self.btn_updates.clicked.connect(lambda: self.on_tab_click("Updates"))
         self.layout.addWidget(self.btn_updates)
+
+        self.btn_jobs = SidebarButton("Jobs")
+        self.btn_jobs.clicked.connect(lambda: self.on_tab_click("Jobs"))
+        self.layout.addWidget(self.btn_jobs)
         
         self.btn_history = SidebarButton("History")
         self.btn_history.clicked.connect(lambda: self.on_tab_click("History"))
@@ -130,6 +134,7 @@ class Sidebar(QFrame):
             "Flatpak": self.btn_flatpak,
             "AppImage": self.btn_appimage,
             "Updates": self.btn_updates,
+            "Jobs": self.btn_jobs,
             "History": self.btn_history,
             "PPAs": self.btn_ppas,
             "Stats": self.btn_stats,
@@ -150,3 +155,6 @@ class Sidebar(QFrame):
 
     def set_updates_count(self, count):
         self.btn_updates.update_badge(count)
+
+    def set_jobs_count(self, count):
+        self.btn_jobs.update_badge(count)
@@ -2,10 +2,13 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QFrame, QScrollArea, QProgressBar, QSpacerItem, QSizePolicy
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from core.apt_backend import AptBackend, InstallWorker
-from core.snap_backend import SnapBackend
-from core.flatpak_backend import FlatpakBackend
+from PyQt6.QtCore import Qt, QThread, QCoreApplication, pyqtSignal
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import subprocess
+import time
+from core.jobs import Job, InstallJob, JobQueue
+from core.process import Cancelled, CancelToken
+from core.update_checker import UpdateChecker
 
 class UpdatesView(QWidget):
     updatesFound = pyqtSignal(int)
@@ -14,7 +17,15 @@ class UpdatesView(QWidget):
         super().__init__(parent)
         self.setObjectName("updatesView")
         self.updates = []
+        self.by_backend = {}
+        self.checking = []
+        self.failures = {}
+        self.bulk_status = {}
+        self.bulk_jobs = []
+        self.bulk_results = {}
+        self.worker_check = None
         self.init_ui()
+        QCoreApplication.instance().aboutToQuit.connect(self.shutdown)
 
     def init_ui(self):
         layout = QVBoxLayout(self)
@@ -31,7 +42,7 @@ class UpdatesView(QWidget):
         self.btn_refresh = QPushButton("Refresh List")
         self.btn_refresh.setObjectName("sidebarBtn")
         self.btn_refresh.setFixedWidth(140)
-        self.btn_refresh.clicked.connect(self.check_updates)
+        self.btn_refresh.clicked.connect(lambda: self.check_updates(force=True))
         h_title.addWidget(self.btn_refresh)
         
         self.btn_update_all = QPushButton("Update All")
@@ -75,28 +86,68 @@ class UpdatesView(QWidget):
         layout.addWidget(self.progress_area)
         self.progress_area.hide()
 
-    def check_updates(self):
-        self.status_label.setText("Checking for updates... please wait.")
+    def load_cached(self):
+        """Shows the last persisted result of every backend, so the badge is right before any check runs"""
+        cached = UpdateChecker.load_cached()
+        for backend in UpdateChecker.BACKENDS:
+            if backend in cached:
+                self.by_backend[backend] = cached[backend]["updates"]
+        if cached:
+            checked = time.strftime("%Y-%m-%d %H:%M", time.localtime(max(e["time"] for e in cached.values())))
+            self.refresh_list(f"Last checked {checked}.")
+
+    def check_updates(self, force=True):
+        """Re-queries every backend, or with force=False only those whose last result is stale"""
+        if self.checking: return
+        backends = list(UpdateChecker.BACKENDS) if force else UpdateChecker.stale_backends()
+        if not backends: return
+        self.checking = backends
+        self.failures = {}
         self.btn_refresh.setEnabled(False)
-        self.clear_list()
-        
-        self.updates = []
-        self.worker_apt = UpdateCheckWorker()
-        self.worker_apt.finished.connect(self.on_updates_loaded)
-        self.worker_apt.start()
+        self.status_label.setText(f"Checking {', '.join(backends)} for updates...")
 
-    def on_updates_loaded(self, updates):
-        self.updates.extend(updates)
-        self.status_label.setText(f"Found {len(self.updates)} updates available.")
-        self.updatesFound.emit(len(self.updates))
+        self.worker_check = UpdateCheckWorker(backends)
+        self.worker_check.backendChecked.connect(self.on_backend_checked)
+        self.worker_check.backendFailed.connect(self.on_backend_failed)
+        self.worker_check.finished.connect(self.on_check_finished)
+        self.worker_check.start()
+
+    def shutdown(self):
+        # A running check kills its store queries instead of waiting out their deadlines
+        if self.worker_check is not None and self.worker_check.isRunning():
+            self.worker_check.cancel()
+            self.worker_check.wait()
+
+    def on_backend_checked(self, backend, updates):
+        if backend in self.checking: self.checking.remove(backend)
+        self.by_backend[backend] = updates
+        self.refresh_list()
+
+    def on_backend_failed(self, backend, error):
+        if backend in self.checking: self.checking.remove(backend)
+        self.failures[backend] = error
+        self.refresh_list()
+
+    def on_check_finished(self):
+        self.checking = []
         self.btn_refresh.setEnabled(True)
-        
-        if self.updates:
-            self.btn_update_all.show()
-            for up in self.updates:
-                self.add_update_card(up)
-        else:
-            self.btn_update_all.hide()
+        self.refresh_list()
+
+    def refresh_list(self, note=""):
+        self.updates = [up for backend in UpdateChecker.BACKENDS for up in self.by_backend.get(backend, [])]
+        self.clear_list()
+        for up in self.updates:
+            self.add_update_card(up)
+        self.btn_update_all.setVisible(bool(self.updates))
+        text = f"Found {len(self.updates)} updates available."
+        if self.checking:
+            text += f" Still checking {', '.join(self.checking)}..."
+        if self.failures:
+            text += " (" + "; ".join(f"{b} check failed: {e}" for b, e in self.failures.items()) + ")"
+        if note:
+            text += f" {note}"
+        self.status_label.setText(text)
+        self.updatesFound.emit(len(self.updates))
 
     def add_update_card(self, up):
         card = QFrame()
@@ -108,7 +159,8 @@ class UpdatesView(QWidget):
         v_info = QVBoxLayout()
         name = QLabel(up["name"])
         name.setStyleSheet("font-size: 15px; font-weight: bold;")
-        version = QLabel(f"New Version: {up['version']} ({up['type']})")
+        current = f"{up['installed']} → " if up.get("installed") else ""
+        version = QLabel(f"New Version: {current}{up['version']} ({up['type']})")
         version.setStyleSheet("font-size: 12px; color: #a0a0a0;")
         v_info.addWidget(name)
         v_info.addWidget(version)
@@ -134,15 +186,68 @@ class UpdatesView(QWidget):
         self.progress_label.setText(f"Updating {up['name']}...")
         self.progress_bar.setRange(0, 0) # Indeterminate
         
-        self.worker = InstallWorker(up["name"], up["type"], action="upgrade")
+        self.worker = InstallJob(up.get("id") or up["name"], up["type"], action="upgrade", priority=Job.HIGH)
         self.worker.progress.connect(lambda m: self.progress_label.setText(m))
+        self.worker.stateChanged.connect(lambda j=self.worker: self.progress_label.setText(j.message))
+        self.worker.progressInfo.connect(self.on_update_progress)
         self.worker.finished.connect(self.on_update_finished)
-        self.worker.start()
+        JobQueue.instance().submit(self.worker)
 
     def update_all(self):
-        # Implementation for update-all could be sequential or using a bulk command
-        if self.updates:
-            self.start_update(self.updates[0]) # Start with first for now
+        """One transaction per ecosystem for everything listed, instead of one run per package"""
+        if not self.updates: return
+        self.btn_update_all.setEnabled(False)
+        self.btn_refresh.setEnabled(False)
+        self.progress_area.show()
+        self.progress_bar.setRange(0, 0)
+
+        groups = {}
+        for up in self.updates:
+            # Flatpak updates are keyed by application id, the name is only the display name
+            groups.setdefault(up["type"], []).append(up.get("id") or up["name"])
+        # One job per ecosystem: APT ones wait their turn on the dpkg lock, Snap and Flatpak run alongside
+        self.bulk_jobs = [InstallJob(names, backend, action="upgrade") for backend, names in groups.items()]
+        self.bulk_status = {job.backend: "Queued" for job in self.bulk_jobs}
+        self.bulk_results = {}
+        self.show_bulk_status()
+        for job in self.bulk_jobs:
+            job.progress.connect(lambda m, b=job.backend: self.on_bulk_progress(b, m))
+            job.stateChanged.connect(lambda j=job: self.on_bulk_progress(j.backend, j.message))
+            job.progressInfo.connect(self.on_bulk_percent)
+            job.finished.connect(lambda ok, m, b=job.backend: self.on_bulk_backend_finished(b, ok, m))
+            JobQueue.instance().submit(job)
+
+    def on_bulk_progress(self, backend, message):
+        self.bulk_status[backend] = message
+        self.show_bulk_status()
+
+    def on_bulk_percent(self, info):
+        # The bar shows the mean over all ecosystems, finished ones counting as complete
+        done = [100 if job.state not in Job.ACTIVE else job.info.get("percent") or 0 for job in self.bulk_jobs]
+        self.on_update_progress({"percent": sum(done) / len(done)})
+
+    def on_bulk_backend_finished(self, backend, ok, message):
+        self.on_bulk_progress(backend, ("✓ " if ok else "✗ ") + message)
+        self.bulk_results[backend] = ok
+        if len(self.bulk_results) < len(self.bulk_jobs): return
+        failed = [b for b, ok in self.bulk_results.items() if not ok]
+        self.on_bulk_finished(f"Update failed for {', '.join(failed)}" if failed else "All updates installed")
+
+    def show_bulk_status(self):
+        self.progress_label.setText("\n".join(f"{b}: {m}" for b, m in self.bulk_status.items()))
+
+    def on_bulk_finished(self, message):
+        self.btn_update_all.setEnabled(True)
+        self.progress_bar.setRange(0, 1)
+        self.progress_bar.setValue(1)
+        self.progress_label.setText(self.progress_label.text() + f"\n{message}")
+        self.btn_refresh.setEnabled(True)
+        self.check_updates()
+
+    def on_update_progress(self, info):
+        if info.get("percent") is not None:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(int(info["percent"]))
 
     def on_update_finished(self, success, message):
         self.progress_bar.setRange(0, 1)
@@ -152,10 +257,35 @@ class UpdatesView(QWidget):
             self.check_updates()
 
 class UpdateCheckWorker(QThread):
-    finished = pyqtSignal(list)
+    """Checks the given backends concurrently; each result is emitted, and persisted, as soon as it is in"""
+    backendChecked = pyqtSignal(str, list)
+    backendFailed = pyqtSignal(str, str)
+    def __init__(self, backends):
+        super().__init__()
+        self.backends = backends
+        self.token = CancelToken()
+
+    def cancel(self):
+        self.token.cancel()
+
     def run(self):
-        updates = []
-        updates.extend(AptBackend.get_upgradable())
-        updates.extend(SnapBackend.get_upgradable())
-        updates.extend(FlatpakBackend.get_upgradable())
-        self.finished.emit(updates)
+        with ThreadPoolExecutor(max_workers=len(self.backends)) as pool:
+            futures = {pool.submit(UpdateChecker.check, b, self.token): b for b in self.backends}
+            for future in as_completed(futures):
+                if self.token.cancelled: break
+                backend = futures[future]
+                try:
+                    updates = future.result()
+                except Cancelled:
+                    break
+                except subprocess.TimeoutExpired:
+                    self.backendFailed.emit(backend, "timed out")
+                    continue
+                except subprocess.CalledProcessError as e:
+                    self.backendFailed.emit(backend, f"{e.cmd[0]} exited with status {e.returncode}")
+                    continue
+                except Exception as e:
+                    self.backendFailed.emit(backend, str(e))
+                    continue
+                UpdateChecker.save(backend, updates)
+                self.backendChecked.emit(backend, updates)
@@ -0,0 +1,194 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+from PyQt6.QtCore import Qt, QObject, QRunnable, QThreadPool, QCoreApplication, pyqtSignal
+from PyQt6.QtGui import QImage, QImageReader, QPixmap, QPainter, QColor, QFont
+from core.cache import DiskCache
+
+class IconCache:
+    """Two-tier cache of decoded package icons.
+    Tier 1: in-memory LRU of QPixmaps keyed by (source, size, theme).
+    Tier 2: pre-rasterised PNG thumbnails under ~/.cache/linuxpkgmanager/thumbnails,
+    keyed by source path, mtime and size, so SVGs are rendered once per size."""
+    MAX_ENTRIES = 512
+    thumb_dir = DiskCache.cache_dir / "thumbnails"
+    _pixmaps = OrderedDict()
+    hits = 0
+    misses = 0
+
+    @staticmethod
+    def thumbnail_path(path, size):
+        st = os.stat(path)
+        key = f"{path}|{st.st_mtime_ns}|{st.st_size}|{size}"
+        return IconCache.thumb_dir / (hashlib.sha1(key.encode()).hexdigest() + ".png")
+
+    @staticmethod
+    def load_image(path, size):
+        """Returns a QImage of at most size x size, from the thumbnail cache when possible.
+        Uses only QImage, so it is safe to call off the GUI thread."""
+        try:
+            thumb = IconCache.thumbnail_path(path, size)
+        except OSError:
+            return QImage()
+        if thumb.exists():
+            image = QImage(str(thumb))
+            if not image.isNull():
+                return image
+        reader = QImageReader(path)
+        source = reader.size()
+        if source.isValid():
+            # Vector formats render straight at the target size instead of being scaled afterwards
+            reader.setScaledSize(source.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio))
+        image = reader.read()
+        if image.isNull():
+            return image
+        if image.width() > size or image.height() > size:
+            image = image.scaled(size, size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        try:
+            IconCache.thumb_dir.mkdir(parents=True, exist_ok=True)
+            image.save(str(thumb), "PNG")
+        except OSError: pass
+        return image
+
+    @staticmethod
+    def letter_avatar(name, size):
+        avatar = QImage(size, size, QImage.Format.Format_ARGB32_Premultiplied)
+        avatar.fill(Qt.GlobalColor.transparent)
+        painter = QPainter(avatar)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        color_idx = hash(name) % 360
+        painter.setBrush(QColor.fromHsv(color_idx, 160, 180))
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.drawRoundedRect(0, 0, size, size, 16, 16)
+        painter.setPen(Qt.GlobalColor.white)
+        painter.setFont(QFont("Inter", 24 if size > 48 else 18, QFont.Weight.Bold))
+        painter.drawText(avatar.rect(), Qt.AlignmentFlag.AlignCenter, name[0].upper())
+        painter.end()
+        return avatar
+
+    @staticmethod
+    def key(pkg, size, theme):
+        return (pkg.get("icon") or "avatar:" + pkg["name"], size, theme)
+
+    @staticmethod
+    def cached(key):
+        pixmap = IconCache._pixmaps.get(key)
+        if pixmap is not None:
+            IconCache._pixmaps.move_to_end(key)
+            IconCache.hits += 1
+        return pixmap
+
+    @staticmethod
+    def store(key, pixmap):
+        IconCache._pixmaps[key] = pixmap
+        IconCache._pixmaps.move_to_end(key)
+        while len(IconCache._pixmaps) > IconCache.MAX_ENTRIES:
+            IconCache._pixmaps.popitem(last=False)
+
+    @staticmethod
+    def pixmap(pkg, size, theme="dark"):
+        key = IconCache.key(pkg, size, theme)
+        pixmap = IconCache.cached(key)
+        if pixmap is not None:
+            return pixmap
+        IconCache.misses += 1
+        image = IconCache.load_image(pkg["icon"], size) if pkg.get("icon") else QImage()
+        if image.isNull():
+            image = IconCache.letter_avatar(pkg["name"], size)
+        pixmap = QPixmap.fromImage(image)
+        IconCache.store(key, pixmap)
+        return pixmap
+
+class _IconJob(QRunnable):
+    def __init__(self, loader):
+        super().__init__()
+        self.loader = loader
+
+    def run(self):
+        while True:
+            job = self.loader.take()
+            if job is None: return
+            key, path, size, name = job
+            image = IconCache.load_image(path, size)
+            if image.isNull():
+                # Broken icons keep their avatar so they are not decoded again
+                image = IconCache.letter_avatar(name, size)
+            self.loader.loaded.emit(key, image)
+
+class IconLoader(QObject):
+    """Decodes icons on a background pool and hands back the letter avatar until they arrive.
+    Pending requests are served newest first, so the rows on screen decode before ones scrolled past,
+    and `retain` drops requests for rows that are no longer visible."""
+    MAX_THREADS = 2
+    iconReady = pyqtSignal(object)
+    loaded = pyqtSignal(object, QImage)
+    _instance = None
+
+    @staticmethod
+    def instance():
+        if IconLoader._instance is None:
+            app = QCoreApplication.instance()
+            IconLoader._instance = IconLoader(app)
+            app.aboutToQuit.connect(IconLoader._instance.shutdown)
+        return IconLoader._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(self.MAX_THREADS)
+        self.pending = OrderedDict()
+        self.loading = set()
+        self.running = 0
+        self.lock = threading.Lock()
+        self.loaded.connect(self.on_loaded)
+
+    def request(self, pkg, size, theme="dark"):
+        """Returns the cached icon, or the letter avatar while the real icon is decoded"""
+        key = IconCache.key(pkg, size, theme)
+        pixmap = IconCache.cached(key)
+        if pixmap is not None:
+            return pixmap
+        if not pkg.get("icon"):
+            return IconCache.pixmap(pkg, size, theme)
+        with self.lock:
+            if key in self.loading:
+                return IconCache.pixmap({"name": pkg["name"]}, size, theme)
+            self.pending[key] = (pkg["icon"], size, pkg["name"])
+            self.pending.move_to_end(key)
+            start = self.running < self.MAX_THREADS
+            if start: self.running += 1
+        if start:
+            self.pool.start(_IconJob(self))
+        return IconCache.pixmap({"name": pkg["name"]}, size, theme)
+
+    def take(self):
+        with self.lock:
+            if not self.pending:
+                self.running -= 1
+                return None
+            key, job = self.pending.popitem(last=True)
+            self.loading.add(key)
+            return (key,) + job
+
+    def shutdown(self):
+        with self.lock:
+            self.pending.clear()
+        self.pool.waitForDone()
+
+    def is_pending(self, key):
+        with self.lock:
+            return key in self.pending or key in self.loading
+
+    def retain(self, keys):
+        """Drops pending requests whose key is not in `keys`"""
+        with self.lock:
+            for key in [k for k in self.pending if k not in keys]:
+                del self.pending[key]
+
+    def on_loaded(self, key, image):
+        with self.lock:
+            self.loading.discard(key)
+        IconCache.misses += 1
+        IconCache.store(key, QPixmap.fromImage(image))
+        self.iconReady.emit(key)
@@ -1,5 +1,7 @@
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QScrollArea, QFrame, QDialog, QPushButton, 
@@ -8,39 +10,63 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QTimer, QPropertyAnimation, QRect, QEasingCurve, QSize, QThread, pyqtSignal
 from PyQt6.QtGui import QIcon, QFont, QPalette, QColor, QDragEnterEvent, QDropEvent
 
-from ui.package_card import PackageCard, SkeletonCard
+from ui.package_list import PackageListView
 from ui.components.sidebar import Sidebar
 from ui.components.search_bar import SearchBar
 from ui.components.dialogs import ConfirmDialog
 from ui.components.maintenance import MaintenanceView
 from ui.components.updates import UpdatesView
+from ui.components.jobs import JobsView
 from ui.components.history import HistoryView
 from ui.components.discover import DiscoverView
 from ui.components.stats import StatsView
 from ui.components.ppa_manager import PPAManagerView
 
-from core.apt_backend import PackageWorker, UninstallWorker, AptBackend, InstallWorker
-from core.snap_backend import SnapWorker
-from core.flatpak_backend import FlatpakBackend
-from core.appimage_backend import AppImageBackend
+from core.apt_backend import AptBackend
+from core.jobs import Job, InstallJob, UninstallJob, JobQueue
+from core.inventory import Inventory
+from core.inventory_watcher import InventoryWatcher
 from core.config import config
 
 class MultiWorker(QThread):
+    backendLoaded = pyqtSignal(str, list, float)
+    backendFailed = pyqtSignal(str, str, float)
     finished = pyqtSignal(list)
+
+    def __init__(self, slices=None, changes=None):
+        super().__init__()
+        self.slices = dict(slices or {})
+        # {backend: inventory keys, or None for the whole backend}: only those backends are looked at
+        self.changes = changes
+
+    def refresh(self, backend):
+        start = time.monotonic()
+        try:
+            if self.changes and self.changes.get(backend) is not None and backend in self.slices:
+                return backend, Inventory.patch(backend, self.changes[backend], self.slices[backend]), True, None, time.monotonic() - start
+            # Only backends whose on-disk validator changed are scanned again
+            data, changed = Inventory.refresh_backend(backend, self.slices.get(backend))
+            return backend, data, changed, None, time.monotonic() - start
+        except Exception as e:
+            return backend, None, False, str(e) or type(e).__name__, time.monotonic() - start
+
     def run(self):
-        pkgs = []
-        # Apt
-        manual = AptBackend.get_manual_list()
-        pkgs.extend(AptBackend.get_package_details(manual))
-        # Snap
-        from core.snap_backend import SnapBackend
-        pkgs.extend(SnapBackend.get_snaps())
-        # Flatpak
-        if FlatpakBackend.is_available():
-            pkgs.extend(FlatpakBackend.get_installed())
-        # AppImage
-        pkgs.extend(AppImageBackend.get_appimages())
-        self.finished.emit(pkgs)
+        dirty = False
+        backends = [b for b in Inventory.BACKENDS if not self.changes or b in self.changes]
+        with ThreadPoolExecutor(max_workers=len(backends) or 1) as pool:
+            futures = [pool.submit(self.refresh, b) for b in backends]
+            for future in as_completed(futures):
+                backend, data, changed, error, elapsed = future.result()
+                if error is not None:
+                    # Keep whatever was cached for this backend
+                    self.backendFailed.emit(backend, error, elapsed)
+                    continue
+                self.slices[backend] = data
+                dirty = dirty or changed
+                self.backendLoaded.emit(backend, data["packages"], elapsed)
+        if dirty:
+            Inventory.save(self.slices)
+        self.finished.emit(Inventory.merge(self.slices))
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -53,12 +79,16 @@ class MainWindow(QMainWindow):
         self.packages = []
         self.active_tab = "All"
         self.search_term = ""
+        self.worker = None
+        self.worker_busy = False
+        self.pending_changes = {}
         self.view_mode = config.get("view_mode")
 
         self.init_ui()
         self.load_styles()
         self.load_packages()
-        QTimer.singleShot(2000, self.updates_view.check_updates)
+        # Cached results already set the badge; only stale backends are re-queried
+        QTimer.singleShot(2000, lambda: self.updates_view.check_updates(force=False))
 
     def load_styles(self):
         theme = config.get("theme")
@@ -130,18 +160,34 @@ class MainWindow(QMainWindow):
 
         self.browse_layout.addWidget(self.top_bar)
 
-        # Scroll Area
-        self.scroll = QScrollArea()
-        self.scroll.setWidgetResizable(True)
-        self.scroll.setObjectName("mainScroll")
-        self.scroll_container = QWidget()
-        self.scroll_container.setObjectName("scrollContainer")
-        self.packages_layout = QVBoxLayout(self.scroll_container) if self.view_mode == "list" else QGridLayout(self.scroll_container)
-        self.packages_layout.setSpacing(12 if self.view_mode == "list" else 20)
-        self.packages_layout.setContentsMargins(30, 20, 30, 40)
-        self.packages_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.scroll.setWidget(self.scroll_container)
-        self.browse_layout.addWidget(self.scroll)
+        # Batch actions, shown while packages are selected
+        self.selection_bar = QWidget()
+        selection_layout = QHBoxLayout(self.selection_bar)
+        selection_layout.setContentsMargins(30, 0, 30, 0)
+        self.selection_label = QLabel()
+        self.selection_label.setObjectName("packageCounter")
+        selection_layout.addWidget(self.selection_label)
+        selection_layout.addStretch()
+        self.btn_clear_selection = QPushButton("Clear Selection")
+        self.btn_clear_selection.setObjectName("sidebarBtn")
+        self.btn_clear_selection.setFixedWidth(140)
+        selection_layout.addWidget(self.btn_clear_selection)
+        self.btn_uninstall_selected = QPushButton("Uninstall Selected")
+        self.btn_uninstall_selected.setObjectName("dangerBtn")
+        self.btn_uninstall_selected.setFixedWidth(160)
+        self.btn_uninstall_selected.clicked.connect(self.confirm_uninstall_selected)
+        selection_layout.addWidget(self.btn_uninstall_selected)
+        self.selection_bar.hide()
+        self.browse_layout.addWidget(self.selection_bar)
+
+        # Package List (virtualized, rows are painted on demand)
+        self.package_view = PackageListView(self.view_mode, config.get("theme"))
+        self.package_view.delegate.uninstallRequested.connect(self.confirm_uninstall)
+        self.package_view.selectionCountChanged.connect(self.on_selection_changed)
+        self.package_view.uninstallSelectedRequested.connect(self.confirm_uninstall_selected)
+        self.btn_clear_selection.clicked.connect(self.package_view.clearSelection)
+        self.package_view.proxy.set_sort(self.sort_combo.currentText())
+        self.browse_layout.addWidget(self.package_view)
 
         self.stacked_widget.addWidget(self.browse_page)
 
@@ -151,7 +197,12 @@ class MainWindow(QMainWindow):
         
         self.updates_view = UpdatesView()
         self.updates_view.updatesFound.connect(self.sidebar.set_updates_count)
+        self.updates_view.load_cached()
         self.stacked_widget.addWidget(self.updates_view)
+
+        self.jobs_view = JobsView()
+        self.jobs_view.activeCount.connect(self.sidebar.set_jobs_count)
+        self.stacked_widget.addWidget(self.jobs_view)
         
         self.history_view = HistoryView()
         self.stacked_widget.addWidget(self.history_view)
@@ -165,6 +216,11 @@ class MainWindow(QMainWindow):
         self.maintenance_view = MaintenanceView()
         self.stacked_widget.addWidget(self.maintenance_view)
 
+        # Whatever finishes (removals here, installs in Discover, upgrades, cleanups) patches the list
+        JobQueue.instance().jobAdded.connect(lambda job: job.finished.connect(lambda *_: self.on_job_finished(job)))
+        # and so do changes made outside the application
+        InventoryWatcher.instance().backendsChanged.connect(lambda backends: self.refresh_packages(dict.fromkeys(backends)))
+
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
             for url in event.mimeData().urls():
@@ -189,22 +245,79 @@ class MainWindow(QMainWindow):
                 self.start_deb_install(path)
 
     def start_deb_install(self, path):
-        worker = InstallWorker(path, "APT", action="local")
-        worker.finished.connect(lambda s, m: Toast(m, is_error=not s, parent=self))
-        worker.finished.connect(self.load_packages)
-        worker.start()
+        job = InstallJob(path, "APT", action="local", priority=Job.HIGH)
+        job.finished.connect(lambda s, m: Toast(m, is_error=not s, parent=self))
+        JobQueue.instance().submit(job)
 
     def load_packages(self):
-        self.packages = []
-        self.clear_packages()
-        self.pkg_counter.setText("Refreshing database...")
-        self.worker = MultiWorker()
+        if not self.packages:
+            # Stale-while-revalidate: paint the last known inventory right away
+            cached = Inventory.merge(Inventory.load_cached())
+            if cached:
+                self.on_packages_loaded(cached)
+            else:
+                self.clear_packages()
+                self.pkg_counter.setText("Refreshing database...")
+        self.backend_timings = {}
+        # Every backend, each rescanned only if its validator moved; queued behind a running worker
+        self.refresh_packages(dict.fromkeys(Inventory.BACKENDS))
+
+    def start_worker(self, worker):
+        if self.worker is not None:
+            # Its finished signal has been handled, so run() is returning: never drop a live QThread
+            self.worker.wait()
+        self.worker = worker
+        self.worker_busy = True
+        self.worker.backendLoaded.connect(self.on_backend_loaded)
+        self.worker.backendFailed.connect(self.on_backend_failed)
         self.worker.finished.connect(self.on_packages_loaded)
+        self.worker.finished.connect(self.on_worker_finished)
         self.worker.start()
 
+    def on_job_finished(self, job):
+        if job.changed:
+            self.refresh_packages({job.backend: job.changed})
+
+    def refresh_packages(self, changes):
+        """Re-reads only what `changes` names ({backend: inventory keys, or None for the whole
+        backend, rescanned if its validator moved}) and patches the list"""
+        for backend, keys in changes.items():
+            if keys is None or (backend in self.pending_changes and self.pending_changes[backend] is None):
+                self.pending_changes[backend] = None
+            else:
+                self.pending_changes.setdefault(backend, set()).update(keys)
+        # One worker at a time, each saving the cache the next one starts from
+        if not self.pending_changes or self.worker_busy: return
+        changes, self.pending_changes = self.pending_changes, {}
+        self.start_worker(MultiWorker(Inventory.load_cached(), changes))
+
+    def on_worker_finished(self):
+        self.worker_busy = False
+        if self.pending_changes:
+            self.refresh_packages({})
+
+    def on_backend_loaded(self, backend, pkgs, elapsed):
+        self.backend_timings[backend] = f"{backend} {elapsed:.2f}s"
+        self.pkg_counter.setToolTip(" · ".join(self.backend_timings.values()))
+        if [p for p in self.packages if p["type"] == backend] == pkgs:
+            return
+        # Keep backend order stable so the final merged list compares equal
+        merged = []
+        for b in Inventory.BACKENDS:
+            merged.extend(pkgs if b == backend else [p for p in self.packages if p["type"] == b])
+        self.on_packages_loaded(merged)
+
+    def on_backend_failed(self, backend, message, elapsed):
+        self.backend_timings[backend] = f"{backend} failed ({elapsed:.2f}s)"
+        self.pkg_counter.setToolTip(" · ".join(self.backend_timings.values()))
+        Toast(f"{backend}: {message}", is_error=True, parent=self)
+
     def on_packages_loaded(self, pkgs):
+        if pkgs and pkgs == self.packages:
+            return
         self.packages = pkgs
         self.stats_view.update_stats(pkgs)
+        self.package_view.set_packages(pkgs)
         self.filter_packages()
 
     def on_tab_changed(self, tab_name):
@@ -213,6 +326,7 @@ class MainWindow(QMainWindow):
         
         if tab_name == "Discover": self.stacked_widget.setCurrentWidget(self.discover_view)
         elif tab_name == "Updates": self.stacked_widget.setCurrentWidget(self.updates_view)
+        elif tab_name == "Jobs": self.stacked_widget.setCurrentWidget(self.jobs_view)
         elif tab_name == "History": self.stacked_widget.setCurrentWidget(self.history_view); self.history_view.load_history()
         elif tab_name == "Stats": self.stacked_widget.setCurrentWidget(self.stats_view)
         elif tab_name == "PPAs": self.stacked_widget.setCurrentWidget(self.ppa_view); self.ppa_view.load_ppas()
@@ -220,69 +334,80 @@ class MainWindow(QMainWindow):
         else: self.stacked_widget.setCurrentWidget(self.browse_page); self.filter_packages()
 
     def filter_packages(self):
-        self.clear_packages()
-        filtered = [
-            p for p in self.packages
-            if (self.active_tab == "All" or p["type"] == self.active_tab)
-            and (not self.search_term or self.search_term in p["name"].lower() or self.search_term in p.get("description", "").lower())
-        ]
-        
-        sort_type = self.sort_combo.currentText()
-        if sort_type == "Name A-Z": filtered.sort(key=lambda x: x["name"].lower())
-        elif sort_type == "Type": filtered.sort(key=lambda x: x["type"])
-        elif sort_type == "Install Date": filtered.sort(key=lambda x: str(x.get("install_date", "")), reverse=True)
-            
-        self.pkg_counter.setText(f"{len(filtered)} packages found")
-        
-        if self.view_mode == "list":
-            for pkg in filtered:
-                self.packages_layout.addWidget(PackageCard(pkg, self.confirm_uninstall, view_mode="list"))
-        else:
-            cols = max(1, (self.width() - 240) // 250)
-            for i, pkg in enumerate(filtered):
-                self.packages_layout.addWidget(PackageCard(pkg, self.confirm_uninstall, view_mode="grid"), i // cols, i % cols)
+        self.package_view.proxy.set_filter(self.active_tab, self.search_term)
+        self.pkg_counter.setText(f"{self.package_view.proxy.rowCount()} packages found")
 
     def clear_packages(self):
-        while self.packages_layout.count():
-            item = self.packages_layout.takeAt(0)
-            if item.widget(): item.widget().deleteLater()
+        self.package_view.set_packages([])
 
     def toggle_view_mode(self):
         self.view_mode = "grid" if self.view_mode == "list" else "list"
         config.set("view_mode", self.view_mode)
         self.view_toggle.setText("🔲" if self.view_mode == "list" else "☰")
-        
-        old_layout = self.scroll_container.layout()
-        if old_layout:
-            self.clear_packages()
-            from PyQt6 import sip
-            sip.delete(old_layout)
-            
-        self.packages_layout = QVBoxLayout(self.scroll_container) if self.view_mode == "list" else QGridLayout(self.scroll_container)
-        self.packages_layout.setSpacing(12 if self.view_mode == "list" else 20)
-        self.packages_layout.setContentsMargins(30, 20, 30, 40)
-        self.packages_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.filter_packages()
+        self.package_view.set_view_mode(self.view_mode)
 
     def toggle_theme(self):
         new_theme = "light" if config.get("theme") == "dark" else "dark"
         config.set("theme", new_theme)
         self.load_styles()
+        self.package_view.set_theme(new_theme)
 
     def on_sort_changed(self):
         config.set("sort_by", self.sort_combo.currentText())
-        self.filter_packages()
+        self.package_view.proxy.set_sort(self.sort_combo.currentText())
 
     def on_search_changed(self, text):
         self.search_term = text.lower()
         self.filter_packages()
 
+    def on_selection_changed(self, count):
+        self.selection_bar.setVisible(count > 0)
+        self.selection_label.setText(f"{count} selected")
+
     def confirm_uninstall(self, pkg):
+        selected = self.package_view.selected_packages()
+        if len(selected) > 1 and pkg in selected:
+            # The Uninstall button of a selected card acts on the whole selection
+            self.confirm_uninstall_batch(selected)
+            return
         diag = ConfirmDialog("Uninstall", f"Remove {pkg['name']}?", parent=self)
         if diag.exec():
-            worker = UninstallWorker(pkg.get("path") or pkg.get("id") or pkg["name"], pkg["type"])
-            worker.finished.connect(lambda s, m: (Toast(m, is_error=not s, parent=self), self.load_packages()))
-            worker.start()
+            job = UninstallJob(Inventory.key(pkg), pkg["type"], priority=Job.HIGH)
+            job.finished.connect(lambda s, m: Toast(m, is_error=not s, parent=self))
+            JobQueue.instance().submit(job)
+
+    def confirm_uninstall_selected(self):
+        selected = self.package_view.selected_packages()
+        if len(selected) == 1:
+            self.confirm_uninstall(selected[0])
+        elif selected:
+            self.confirm_uninstall_batch(selected)
+
+    def confirm_uninstall_batch(self, pkgs):
+        """One confirmation and one removal per ecosystem; each patches the list as it finishes"""
+        groups = {}
+        for pkg in pkgs:
+            groups.setdefault(pkg["type"], []).append(Inventory.key(pkg))
+        counts = ", ".join(f"{backend} {len(names)}" for backend, names in groups.items())
+        names = [pkg["name"] for pkg in pkgs]
+        preview = ", ".join(names[:6]) + (f" and {len(names) - 6} more" if len(names) > 6 else "")
+        diag = ConfirmDialog("Uninstall", f"Remove {len(pkgs)} packages ({counts})?\n\n{preview}", parent=self)
+        if not diag.exec(): return
+        self.package_view.clearSelection()
+        jobs = [UninstallJob(names, backend, priority=Job.HIGH) for backend, names in groups.items()]
+        results = {}
+        for job in jobs:
+            job.finished.connect(lambda ok, m, j=job: self.on_batch_job_finished(jobs, results, j, ok))
+            JobQueue.instance().submit(job)
+
+    def on_batch_job_finished(self, jobs, results, job, ok):
+        results[job.backend] = ok
+        if len(results) < len(jobs): return
+        failed = [b for b, ok in results.items() if not ok]
+        if failed:
+            Toast(f"Removal failed for {', '.join(failed)}", is_error=True, parent=self)
+        else:
+            Toast(f"Uninstalled {sum(len(j.names) for j in jobs)} packages", parent=self)
 
 class Toast(QFrame):
     def __init__(self, message, is_error=False, parent=None):
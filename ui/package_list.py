@@ -0,0 +1,351 @@
+from PyQt6.QtWidgets import QListView, QStyledItemDelegate, QStyle, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, QRect, QSize, QEvent, pyqtSignal
+from PyQt6.QtGui import QColor, QPainter, QFont, QFontMetrics, QPen
+from core.search_index import SearchIndex
+from ui.icon_cache import IconCache, IconLoader
+
+# Colours mirror the packageCard / pkgName / pkgMeta / pkgDesc rules of styles.qss and styles_light.qss
+THEMES = {
+    "dark": {"hover_bg": "#2d2d2d", "hover_border": "#3d3d3d", "selected": "#3584e4", "name": "#ffffff", "meta": "#a0a0a0", "desc": "#cccccc"},
+    "light": {"hover_bg": "#ffffff", "hover_border": "#dcdcdc", "selected": "#3584e4", "name": "#2e3436", "meta": "#888a85", "desc": "#555753"},
+}
+
+LIST_HEIGHT = 100
+GRID_SIZE = QSize(220, 240)
+LIST_MARGIN = 24
+GRID_SPACING = 20
+
+class PackageListModel(QAbstractListModel):
+    """Resident store of every installed package, with a search index built once per load"""
+    PackageRole = Qt.ItemDataRole.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.packages = []
+        self.index = SearchIndex()
+        self.by_type = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.packages)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.packages):
+            return None
+        return self.package_data(index.row(), role)
+
+    def package_data(self, row, role):
+        pkg = self.packages[row]
+        if role == PackageListModel.PackageRole: return pkg
+        if role == Qt.ItemDataRole.DisplayRole: return pkg["name"]
+        if role == Qt.ItemDataRole.ToolTipRole: return pkg.get("description", "")
+        return None
+
+    def set_packages(self, packages):
+        self.beginResetModel()
+        self.packages = list(packages)
+        self.index = SearchIndex()
+        self.by_type = {}
+        for row, pkg in enumerate(self.packages):
+            self.index.add(pkg["name"], pkg.get("description", ""))
+            self.by_type.setdefault(pkg["type"], set()).add(row)
+        self.index.build()
+        self.endResetModel()
+
+class PackageFilterProxy(QAbstractListModel):
+    """Filtered, sorted projection of a PackageListModel.
+    Changing the tab, query or sort only rebuilds the list of visible source rows.
+    Queries are answered by the source's SearchIndex and ranked by match quality,
+    the selected sort order breaking ties."""
+    SORT_KEYS = {
+        "Name A-Z": (lambda p: p["name"].lower(), False),
+        "Type": (lambda p: p["type"], False),
+        "Install Date": (lambda p: (p.get("install_ts", 0), str(p.get("install_date", ""))), True),
+    }
+
+    def __init__(self, source, parent=None):
+        super().__init__(parent)
+        self.source = source
+        self.tab = "All"
+        self.term = ""
+        self.sort_type = "Name A-Z"
+        self.rows = []
+        self._orders = {}
+        self._scores = None
+        self._scores_term = None
+        self.source.modelReset.connect(self.on_source_reset)
+
+    def rowCount(self, parent=QModelIndex()):
+        # Hot path: the list layout queries this once per row
+        return len(self.rows) if not parent.isValid() else 0
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self.rows):
+            return None
+        return self.source.package_data(self.rows[index.row()], role)
+
+    def on_source_reset(self):
+        self._orders = {}
+        self._scores = None
+        self.refresh()
+
+    def set_filter(self, tab, term):
+        self.tab, self.term = tab, term.lower()
+        self.refresh()
+
+    def set_sort(self, sort_type):
+        self.sort_type = sort_type
+        self.refresh()
+
+    def order(self):
+        """(source rows in sort order, position of each source row in that order)"""
+        cached = self._orders.get(self.sort_type)
+        if cached is None:
+            key, reverse = self.SORT_KEYS.get(self.sort_type, self.SORT_KEYS["Name A-Z"])
+            pkgs = self.source.packages
+            order = sorted(range(len(pkgs)), key=lambda row: key(pkgs[row]), reverse=reverse)
+            positions = [0] * len(order)
+            for pos, row in enumerate(order):
+                positions[row] = pos
+            cached = self._orders[self.sort_type] = (order, positions)
+        return cached
+
+    def matches(self):
+        """{source row: score} for the current query, or None when there is no query"""
+        if not self.term:
+            return None
+        if self._scores is None or self._scores_term != self.term:
+            self._scores = dict(self.source.index.search(self.term))
+            self._scores_term = self.term
+        return self._scores
+
+    def refresh(self):
+        scores = self.matches()
+        by_type = self.source.by_type.get(self.tab, set()) if self.tab != "All" else None
+        order, positions = self.order()
+        if scores is None:
+            rows = order if by_type is None else [row for row in order if row in by_type]
+        else:
+            # Only the matches are touched: best matches first, the selected sort order among equals
+            rows = [row for row in scores if by_type is None or row in by_type]
+            rows.sort(key=lambda row: (-scores[row], positions[row]))
+        if rows == self.rows:
+            return
+        self.beginResetModel()
+        self.rows = list(rows)
+        self.endResetModel()
+
+class PackageDelegate(QStyledItemDelegate):
+    """Paints a package card for each visible row instead of building a widget tree per package"""
+    uninstallRequested = pyqtSignal(dict)
+
+    def __init__(self, view_mode="list", theme="dark", parent=None):
+        super().__init__(parent)
+        self.view_mode = view_mode
+        self.theme = theme
+        self.colors = THEMES.get(theme, THEMES["dark"])
+        # Icon keys drawn during the current full repaint, i.e. the visible rows
+        self.painted = set()
+        self.name_font = QFont("Inter", 12, QFont.Weight.Bold)
+        self.name_font.setPixelSize(16)
+        self.meta_font = QFont("Inter")
+        self.meta_font.setPixelSize(12)
+        self.desc_font = QFont("Inter")
+        self.desc_font.setPixelSize(13)
+        self.badge_font = QFont("Inter", 8, QFont.Weight.Bold)
+        self.badge_font.setPixelSize(10)
+        self.button_font = QFont("Inter", 9, QFont.Weight.Bold)
+        self.button_font.setPixelSize(12)
+
+    def set_theme(self, theme):
+        self.theme = theme
+        self.colors = THEMES.get(theme, THEMES["dark"])
+
+    def sizeHint(self, option, index):
+        if self.view_mode == "grid":
+            return GRID_SIZE
+        view = self.parent()
+        width = view.viewport().width() - 2 * view.spacing() if view is not None else option.rect.width()
+        return QSize(max(width, 200), LIST_HEIGHT)
+
+    def card_rect(self, option):
+        if self.view_mode == "grid":
+            return QRect(option.rect.topLeft(), GRID_SIZE)
+        return option.rect.adjusted(LIST_MARGIN, 0, -LIST_MARGIN, 0)
+
+    def button_rect(self, card):
+        if self.view_mode == "grid":
+            return QRect(card.center().x() - 60, card.bottom() - 16 - 32, 120, 32)
+        return QRect(card.right() - 16 - 100, card.center().y() - 16, 100, 32)
+
+    def icon_pixmap(self, pkg, size):
+        self.painted.add(IconCache.key(pkg, size, self.theme))
+        return IconLoader.instance().request(pkg, size, self.theme)
+
+    def draw_badge(self, painter, x, y, pkg_type):
+        painter.setFont(self.badge_font)
+        text = pkg_type.upper()
+        rect = QRect(x, y, QFontMetrics(self.badge_font).horizontalAdvance(text) + 16, 18)
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#6366f1" if pkg_type == "APT" else "#ec4899"))
+        painter.drawRoundedRect(rect, 4, 4)
+        painter.setPen(QColor("white"))
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        return rect
+
+    def draw_button(self, painter, rect):
+        painter.setPen(Qt.PenStyle.NoPen)
+        painter.setBrush(QColor("#ef4444"))
+        painter.drawRoundedRect(rect, 6, 6)
+        painter.setPen(QColor("white"))
+        painter.setFont(self.button_font)
+        painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, "Uninstall")
+
+    def paint(self, painter, option, index):
+        pkg = index.data(PackageListModel.PackageRole)
+        if pkg is None: return
+        hovered = bool(option.state & QStyle.StateFlag.State_MouseOver)
+        card = self.card_rect(option)
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        selected = bool(option.state & QStyle.StateFlag.State_Selected)
+        if hovered or selected:
+            painter.setPen(QPen(QColor(self.colors["selected" if selected else "hover_border"]), 2 if selected else 1))
+            painter.setBrush(QColor(self.colors["hover_bg"]))
+            painter.drawRoundedRect(card.adjusted(0, 0, -1, -1), 10, 10)
+
+        if self.view_mode == "grid":
+            self.paint_grid(painter, card, pkg)
+        else:
+            self.paint_list(painter, card, pkg, hovered)
+
+        if hovered:
+            self.draw_button(painter, self.button_rect(card))
+        painter.restore()
+
+    def paint_list(self, painter, card, pkg, hovered):
+        painter.drawPixmap(card.left() + 16, card.top() + 18, self.icon_pixmap(pkg, 64))
+        x = card.left() + 96
+        right = card.right() - (136 if hovered else 16)
+        width = max(right - x, 40)
+
+        painter.setFont(self.name_font)
+        painter.setPen(QColor(self.colors["name"]))
+        name_fm = QFontMetrics(self.name_font)
+        name = name_fm.elidedText(pkg["name"], Qt.TextElideMode.ElideRight, width - 80)
+        painter.drawText(QRect(x, card.top() + 12, width, 24), Qt.AlignmentFlag.AlignVCenter, name)
+        self.draw_badge(painter, x + name_fm.horizontalAdvance(name) + 8, card.top() + 15, pkg["type"])
+
+        painter.setFont(self.meta_font)
+        painter.setPen(QColor(self.colors["meta"]))
+        meta = f"Version: {pkg['version']}    •  {pkg['install_date']}"
+        meta = QFontMetrics(self.meta_font).elidedText(meta, Qt.TextElideMode.ElideRight, width)
+        painter.drawText(QRect(x, card.top() + 40, width, 18), Qt.AlignmentFlag.AlignVCenter, meta)
+
+        desc_text = pkg.get("description", "").split('\n')[0]
+        if len(desc_text) > 120: desc_text = desc_text[:117] + "..."
+        painter.setFont(self.desc_font)
+        painter.setPen(QColor(self.colors["desc"]))
+        painter.drawText(QRect(x, card.top() + 60, width, 34), Qt.TextFlag.TextWordWrap, desc_text)
+
+    def paint_grid(self, painter, card, pkg):
+        painter.drawPixmap(card.center().x() - 32, card.top() + 20, self.icon_pixmap(pkg, 64))
+        painter.setFont(self.name_font)
+        painter.setPen(QColor(self.colors["name"]))
+        name_rect = QRect(card.left() + 16, card.top() + 92, card.width() - 32, 44)
+        flags = Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignTop | Qt.TextFlag.TextWordWrap
+        drawn = painter.drawText(name_rect, flags, pkg["name"])
+        badge_w = QFontMetrics(self.badge_font).horizontalAdvance(pkg["type"].upper()) + 16
+        self.draw_badge(painter, card.center().x() - badge_w // 2, min(drawn.bottom(), name_rect.bottom()) + 8, pkg["type"])
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() == QEvent.Type.MouseButtonRelease and event.button() == Qt.MouseButton.LeftButton:
+            if self.button_rect(self.card_rect(option)).contains(event.position().toPoint()):
+                pkg = index.data(PackageListModel.PackageRole)
+                if pkg is not None:
+                    self.uninstallRequested.emit(pkg)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+class PackageListView(QListView):
+    """Virtualized browse list: only the rows in the viewport are ever painted.
+    Ctrl/Shift-click selects several packages for a batch action."""
+    selectionCountChanged = pyqtSignal(int)
+    uninstallSelectedRequested = pyqtSignal()
+
+    def __init__(self, view_mode="list", theme="dark", parent=None):
+        super().__init__(parent)
+        self.setObjectName("packageList")
+        self.package_model = PackageListModel(self)
+        self.proxy = PackageFilterProxy(self.package_model, self)
+        self.setModel(self.proxy)
+        self.delegate = PackageDelegate(view_mode, theme, self)
+        self.setItemDelegate(self.delegate)
+        self.setMouseTracking(True)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_Hover)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.viewport().setCursor(Qt.CursorShape.PointingHandCursor)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.setUniformItemSizes(True)
+        # Lay rows out in small batches so big result sets never block a keystroke
+        self.setLayoutMode(QListView.LayoutMode.Batched)
+        self.setBatchSize(500)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.setMovement(QListView.Movement.Static)
+        self.setViewportMargins(6, 14, 6, 34)
+        self.set_view_mode(view_mode)
+        IconLoader.instance().iconReady.connect(self.viewport().update)
+        # A reset (new filter or inventory) drops the selection without a selectionChanged
+        self.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.proxy.modelReset.connect(self.on_selection_changed)
+
+    def on_selection_changed(self, *args):
+        self.selectionCountChanged.emit(len(self.selectionModel().selectedIndexes()))
+
+    def selected_packages(self):
+        rows = sorted(index.row() for index in self.selectionModel().selectedIndexes())
+        return [self.proxy.data(self.proxy.index(row), PackageListModel.PackageRole) for row in rows]
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Delete and self.selectionModel().hasSelection():
+            self.uninstallSelectedRequested.emit()
+            return
+        if event.key() == Qt.Key.Key_Escape:
+            self.clearSelection()
+            return
+        super().keyPressEvent(event)
+
+    def paintEvent(self, event):
+        full = event.rect().contains(self.viewport().rect())
+        if full:
+            self.delegate.painted = set()
+        super().paintEvent(event)
+        if full:
+            # Icons still queued for rows that scrolled out of view are not worth decoding
+            IconLoader.instance().retain(self.delegate.painted)
+
+    def set_view_mode(self, view_mode):
+        self.delegate.view_mode = view_mode
+        if view_mode == "grid":
+            self.setViewMode(QListView.ViewMode.IconMode)
+            self.setWrapping(True)
+            self.setFlow(QListView.Flow.LeftToRight)
+            self.setSpacing(GRID_SPACING // 2)
+            self.setGridSize(QSize(GRID_SIZE.width() + GRID_SPACING, GRID_SIZE.height() + GRID_SPACING))
+        else:
+            self.setViewMode(QListView.ViewMode.ListMode)
+            self.setWrapping(False)
+            self.setFlow(QListView.Flow.TopToBottom)
+            self.setGridSize(QSize())
+            self.setSpacing(6)
+        self.setResizeMode(QListView.ResizeMode.Adjust)
+        self.scheduleDelayedItemsLayout()
+
+    def set_theme(self, theme):
+        self.delegate.set_theme(theme)
+        self.viewport().update()
+
+    def set_packages(self, packages):
+        self.package_model.set_packages(packages)